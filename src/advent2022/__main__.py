@@ -1,60 +1,97 @@
+import argparse
 import sys
-from utils import get_logger, read_input
+from utils import get_logger, read_input, setup_logging
 
 log = get_logger(__name__)
 
-from advent2022 import (
-    calories,
-    rock,
-    rucksacks,
-    camp,
-    supply,
-    tuning,
-    device,
-    forest,
-    bridge,
-    cathode,
-    monkeys,
-)
-
-SOLVERS = {
-    '1_1': calories.most_calories_carried,
-    '1_2': calories.top_three_total,
-    '2_1': rock.total_score,
-    '2_2': rock.total_score_strategy_guide,
-    '3_1': rucksacks.sum_priorities_of_common_items,
-    '3_2': rucksacks.sum_priorities_elf_groups,
-    '4_1': camp.count_pairs_with_overlapping_ranges,
-    '4_2': camp.count_pairs_with_some_overlapping_ranges,
-    '5_1': supply.top_crates_9000,
-    '5_2': supply.top_crates_9001,
-    '6_1': tuning.start_of_packet,
-    '6_2': tuning.start_of_message,
-    '7_1': device.sum_dirs_with_at_most_100000,
-    '7_2': device.smallest_dir_to_delte_size,
-    '8_1': forest.count_visible_trees,
-    '8_2': forest.max_scenic_score,
-    '9_1': bridge.positions_tail_visited_at_least_once,
-    '9_2': bridge.positions_tail_visited_at_least_once_long_rope,
-    '10_1': cathode.sum_20_and_40s_strengths,
-    '10_2': cathode.print_crt,
-    '11_1': monkeys.monkey_business,
-}
-
-
-def solver(day, puzzle):
-    try:
-        return SOLVERS[f'{day}_{puzzle}']
-    except KeyError as e:
-        log.error('Solver for {day=} and {puzzle_} not found')
-        raise e
-    except Exception as e:
-        raise e
-
-
-_, day, puzzle = sys.argv
-log.debug(f'{day=} {puzzle=}')
-lines = read_input(day)
-result = solver(day, puzzle)(lines)
-log.info(f'{result=}')
-print(f'result: {result}')
+from advent2022 import cache
+from advent2022.solvers import solver, ENGINES
+
+
+def add_log_level(parser):
+    parser.add_argument('--log-level', default='WARNING', type=str.upper,
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='advent2022',
+        epilog='Use "advent2022 run-all -h" to run many solvers at once, '
+               '"advent2022 bench -h" to benchmark them, '
+               '"advent2022 generate -h" to make synthetic inputs, '
+               '"advent2022 follow -h" to follow a growing calories ledger, '
+               '"advent2022 rank -h" to rank all the elves of one and '
+               '"advent2022 importtime -h" to see what slows down its start.')
+    parser.add_argument('day', nargs='?')
+    parser.add_argument('puzzle', nargs='?')
+    parser.add_argument('--input',
+                        help='input file to solve instead of the day\'s one, '
+                             'maybe compressed (.gz, .xz, .bz2, .zst), - for stdin')
+    parser.add_argument('--engine', choices=sorted(ENGINES),
+                        help='alternative engine to solve the puzzle with')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse the input again, ignoring cached models')
+    parser.add_argument('--profile', choices=['cpu', 'mem'],
+                        help='run the solver under cProfile or tracemalloc')
+    parser.add_argument('--profile-output',
+                        help='.pstats file to write, by default <day>_<puzzle>.pstats')
+    parser.add_argument('--top', type=int, default=20,
+                        help='functions or allocation sites to report when profiling')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='remove every cached model before running')
+    add_log_level(parser)
+    args = parser.parse_args(argv)
+    if args.puzzle is None and not args.clear_cache:
+        parser.error('day and puzzle are required')
+    return args
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    logging_parser = argparse.ArgumentParser(add_help=False)
+    add_log_level(logging_parser)
+    logging_args, argv = logging_parser.parse_known_args(argv)
+    setup_logging(logging_args.log_level)
+
+    if argv[:1] == ['run-all']:
+        from advent2022 import runner
+        return runner.main(argv[1:])
+    if argv[:1] == ['bench']:
+        from advent2022 import bench
+        return bench.main(argv[1:])
+    if argv[:1] == ['generate']:
+        from advent2022 import generators
+        return generators.main(argv[1:])
+    if argv[:1] == ['follow']:
+        from advent2022 import follow
+        return follow.main(argv[1:])
+    if argv[:1] == ['rank']:
+        from advent2022 import rank
+        return rank.main(argv[1:])
+    if argv[:1] == ['importtime']:
+        from advent2022 import importtime
+        return importtime.main(argv[1:])
+
+    args = parse_args(argv)
+    if args.clear_cache:
+        cache.clear()
+    if args.no_cache:
+        cache.enabled = False
+    if args.puzzle is None:
+        return
+    day, puzzle = args.day, args.puzzle
+    log.debug('day=%s puzzle=%s', day, puzzle)
+    lines = read_input(args.input or day)
+    if args.profile:
+        from advent2022.profiling import profile
+        output = args.profile_output or f'{day}_{puzzle}.pstats'
+        result = profile(args.profile, solver(day, puzzle, args.engine), lines,
+                         output=output, top=args.top)
+    else:
+        result = solver(day, puzzle, args.engine)(lines)
+    log.info('result=%r', result)
+    print(f'result: {result}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Benchmarks.
+
+Times every selected solver in three phases: `read` (loading the input
+lines), `parse` (the day's parser alone, for days that have one) and
+`solve` (the solver over the lines already read, with the day's parser
+swapped for one handing out copies of its model, so parsing is left out).
+Days whose solvers stream their lines, and alternative engines, have no
+parse phase: their `solve` includes reading the lines.
+Each phase is repeated after some warmup runs and summarised as
+min/median/p95 seconds. Results are written as JSON and can be compared
+against a previous run, the baseline, flagging medians that got slower
+than the allowed threshold.
+"""
+
+import argparse
+import contextlib
+import copy
+import importlib
+import io
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+from utils import get_logger, read_input
+log = get_logger(__name__)
+
+from advent2022 import cache
+from advent2022.runner import parse_selection, selected_solvers
+from advent2022.solvers import load, solver, ENGINES
+
+PARSERS = {
+    2: ('advent2022.rock', 'line_counts'),
+    4: ('advent2022.camp', 'pair_elves'),
+    5: ('advent2022.supply', 'read_plan'),
+    6: ('advent2022.tuning', 'datastream'),
+    7: ('advent2022.device', 'filesystem'),
+    8: ('advent2022.forest', 'height_map'),
+    9: ('advent2022.bridge', 'read_motions'),
+    10: ('advent2022.cathode', 'read_program'),
+    11: ('advent2022.monkeys', 'monkeys'),
+}
+
+PHASES = ('read', 'parse', 'solve')
+
+
+def percentile(timings, p):
+    ordered = sorted(timings)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summary(timings):
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'p95': percentile(timings, 95),
+        'runs': len(timings),
+    }
+
+
+def measure(fn, *args, repeat=5, warmup=1):
+    """Summary of the wall time of `repeat` calls to `fn`, after `warmup` ones"""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(warmup + repeat):
+            start = time.perf_counter()
+            fn(*args)
+            if i >= warmup:
+                timings.append(time.perf_counter() - start)
+    return summary(timings)
+
+
+@contextlib.contextmanager
+def parsed(day, model, copies):
+    """Swaps the parser of `day` for one handing out `copies` of its parsed
+    `model`, made beforehand, as solvers may change the model they get"""
+    module_name, name = PARSERS[day]
+    module = importlib.import_module(module_name)
+    parser = getattr(module, name)
+    models = [copy.deepcopy(model) for _ in range(copies)]
+    setattr(module, name, lambda lines: models.pop())
+    try:
+        yield
+    finally:
+        setattr(module, name, parser)
+
+
+def bench_day(day, puzzles, repeat=5, warmup=1, engine=None):
+    """Benchmarks of the phases of every puzzle of `day`"""
+    lines = read_input(day).read()
+    read = measure(lambda: read_input(day).read(), repeat=repeat, warmup=warmup)
+    parse = None
+    if day in PARSERS and engine is None:
+        parse = measure(load(PARSERS[day]), lines, repeat=repeat, warmup=warmup)
+        model = load(PARSERS[day])(lines)
+    results = {}
+    for puzzle in puzzles:
+        phases = {'read': read, 'parse': parse}
+        solve = solver(day, puzzle, engine)
+        if parse is None:
+            phases['solve'] = measure(solve, lines, repeat=repeat, warmup=warmup)
+        else:
+            with parsed(day, model, warmup + repeat):
+                phases['solve'] = measure(solve, lines, repeat=repeat, warmup=warmup)
+        results[f'{day}_{puzzle}'] = {k: v for k, v in phases.items() if v is not None}
+    return results
+
+
+def bench(days, puzzles, repeat=5, warmup=1, engine=None):
+    results = {}
+    with cache.using(False):
+        for day, day_puzzles in selected_solvers(days, puzzles, engine).items():
+            log.info('Benchmarking day %s', day)
+            results.update(bench_day(day, day_puzzles, repeat=repeat, warmup=warmup, engine=engine))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'warmup': warmup,
+            'engine': engine,
+        },
+        'results': results,
+    }
+
+
+def regressions(report, baseline, threshold=0.1):
+    """Yields `(key, phase, baseline median, median)` for every phase whose
+    median is more than `threshold` (a fraction) slower than the baseline"""
+    for key, phases in report['results'].items():
+        for phase, stats in phases.items():
+            base = baseline['results'].get(key, {}).get(phase)
+            if base is None:
+                continue
+            if stats['median'] > base['median'] * (1 + threshold):
+                yield key, phase, base['median'], stats['median']
+
+
+def format_report(report):
+    rows = [f'{"solver":<8}{"phase":<8}{"min":>12}{"median":>12}{"p95":>12}']
+    for key, phases in report['results'].items():
+        for phase, stats in phases.items():
+            rows.append(
+                f'{key:<8}{phase:<8}'
+                f'{stats["min"]:>12.6f}{stats["median"]:>12.6f}{stats["p95"]:>12.6f}'
+            )
+    return '\n'.join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='advent2022 bench')
+    parser.add_argument('--days', default='1-25', help='e.g. 1-11 or 1,3,5-7')
+    parser.add_argument('--puzzles', default='1,2', help='e.g. 1,2')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--engine', choices=sorted(ENGINES),
+                        help='benchmark only the puzzles this engine solves, with it')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed slowdown of the median over the baseline, as a fraction')
+    args = parser.parse_args(argv)
+
+    report = bench(parse_selection(args.days), parse_selection(args.puzzles),
+                   repeat=args.repeat, warmup=args.warmup, engine=args.engine)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        slower = list(regressions(report, baseline, threshold=args.threshold))
+        for key, phase, before, after in slower:
+            print(f'REGRESSION {key} {phase}: {before:.6f}s -> {after:.6f}s '
+                  f'({after / before - 1:+.1%})', file=sys.stderr)
+        if slower:
+            return 1
+    return 0
@@ -3,6 +3,7 @@ from collections import namedtuple
 import math
 
 from utils import get_logger, flatten
+from advent2022.cache import cached
 log = get_logger(__name__)
 
 
@@ -43,6 +44,7 @@ class Vector(namedtuple('Vector', ['dx', 'dy'])):
         return self.dx * self.dx + self.dy * self.dy
 
 
+@cached()
 def read_motions(lines):
     return [Motion.from_line(line) for line in lines]
 
@@ -0,0 +1,94 @@
+"""Parsed model cache.
+
+Parsers decorated with `cached` pickle what they return under a key made of
+the parser name, its version and the hash of the input file contents, so
+repeated runs over the same input load the model instead of parsing it
+again. Only lines read from a file (`Input`, `Lines`) are cached: stdin,
+examples and plain lists of lines always go through the parser. Bump
+`version` whenever a parser (or the model it builds) changes.
+"""
+
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+from utils import get_logger, Input, Lines, STDIN, _CURRENT
+log = get_logger(__name__)
+
+CACHE_DIR = Path(os.environ.get('ADVENT2022_CACHE_DIR', Path(_CURRENT) / '.cache'))
+
+enabled = True
+
+@contextlib.contextmanager
+def using(flag):
+    """Enables (or disables) the cache within a `with` block only"""
+    global enabled
+    previous, enabled = enabled, flag
+    try:
+        yield
+    finally:
+        enabled = previous
+
+_digests = {}
+
+def digest(filename):
+    """sha256 of the contents of `filename`, memoized by size and mtime"""
+    stat = os.stat(filename)
+    key = (str(filename), stat.st_size, stat.st_mtime_ns)
+    if key not in _digests:
+        sha = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                sha.update(chunk)
+        _digests[key] = sha.hexdigest()
+    return _digests[key]
+
+def clear():
+    """Removes every cached model"""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+def _load(path):
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning('Ignoring unreadable cache entry %s: %s', path, e)
+        return None
+
+def _store(path, model):
+    tmp = path.with_name(f'{path.name}.{os.getpid()}')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError, RecursionError) as e:
+        log.warning('Unable to cache %s: %s', path.name, e)
+        tmp.unlink(missing_ok=True)
+
+def cached(version=1):
+    """Caches on disk the model returned by a `parser(lines)`"""
+    def decorator(parser):
+        name = f'{parser.__module__}.{parser.__qualname__}'
+
+        @functools.wraps(parser)
+        def wrapper(lines, *args, **kwargs):
+            if (not enabled or args or kwargs
+                    or not isinstance(lines, (Input, Lines))
+                    or lines.filename in (None, STDIN)
+                    or getattr(lines, 'mmap', False)):
+                return parser(lines, *args, **kwargs)
+            path = CACHE_DIR / f'{name}-v{version}-{digest(lines.filename)}.pickle'
+            model = _load(path)
+            if model is None:
+                model = parser(lines)
+                _store(path, model)
+            return model
+        return wrapper
+    return decorator
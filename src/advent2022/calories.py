@@ -1,4 +1,12 @@
+from array import array
 from collections import namedtuple
+from collections.abc import MutableSequence, Sequence
+import heapq
+import itertools
+import os
+
+from utils import read_bytes, plain_filename, iter_block_lines, split_ranges
+from advent2022.cache import cached
 
 class Food(namedtuple('Food', 'raw')):
 
@@ -6,32 +14,337 @@ class Food(namedtuple('Food', 'raw')):
     def calories(self):
         return int(self.raw)
 
-class Elf(list):
+def _calories(food):
+    return food.calories if isinstance(food, Food) else int(food)
 
-    @property
-    def total_calories(self):
-        return sum(map(lambda food: food.calories, self))
+class Elf(MutableSequence):
+    """Food carried by an elf, packed as the calories of every item in an
+    `array('q')`, with their total kept up to date as items change. Still
+    a sequence of `Food`, like the list it used to be: items can be `Food`
+    or anything `int` takes."""
+
+    __slots__ = ('items', 'total_calories')
+
+    def __init__(self, foods=()):
+        self.items = array('q', map(_calories, foods))
+        self.total_calories = sum(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Food(str(calories)) for calories in self.items[index]]
+        return Food(str(self.items[index]))
+
+    def __setitem__(self, index, food):
+        if isinstance(index, slice):
+            self.items[index] = array('q', map(_calories, food))
+            self.total_calories = sum(self.items)
+        else:
+            calories = _calories(food)
+            self.total_calories += calories - self.items[index]
+            self.items[index] = calories
+
+    def __delitem__(self, index):
+        del self.items[index]
+        self.total_calories = sum(self.items)
+
+    def insert(self, index, food):
+        calories = _calories(food)
+        self.items.insert(index, calories)
+        self.total_calories += calories
+
+    def append(self, food):
+        calories = _calories(food)
+        self.items.append(calories)
+        self.total_calories += calories
+
+    def extend(self, foods):
+        for food in foods:
+            self.append(food)
+
+    def __iter__(self):
+        return (Food(str(calories)) for calories in self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __eq__(self, other):
+        if isinstance(other, Elf):
+            return self.items == other.items
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
 
+    def __repr__(self):
+        return f'Elf({self.items.tolist()})'
+
+    def __reduce__(self):
+        return Elf, (self.items,)
+
+@cached(version=2)
 def _elves(lines):
     elves = []
-    elf = Elf()
-    elves.append(elf)
+    calories = []
     for line in lines:
         if len(line) == 0:
-            elf = Elf()
-            elves.append(elf)
+            elves.append(Elf(calories))
+            calories = []
         else:
-            elf.append(Food(line))
+            calories.append(int(line))
+    elves.append(Elf(calories))
     return elves
 
+def elf_totals(lines):
+    """Yields the total calories of every elf as its inventory ends"""
+    total = 0
+    for line in lines:
+        if len(line) == 0:
+            yield total
+            total = 0
+        else:
+            total += int(line)
+    yield total
+
+def keep_top(heap, total, k):
+    """Pushes `total` into the min-heap `heap` of the `k` largest totals"""
+    if len(heap) < k:
+        heapq.heappush(heap, total)
+    elif total > heap[0]:
+        heapq.heapreplace(heap, total)
+
+def top_k(totals, k):
+    """The `k` largest of `totals`, in a bounded min-heap"""
+    heap = []
+    for total in totals:
+        keep_top(heap, total, k)
+    return heap
+
+def top_k_total(lines, k):
+    """Total calories carried by the `k` elves carrying the most, in a
+    single pass over `lines` with O(k) memory"""
+    return sum(top_k(elf_totals(lines), k))
+
 def most_calories_carried(lines):
-    elves = _elves(lines)
-    return max(elf.total_calories for elf in elves)
+    return top_k_total(lines, 1)
 
 def top_three_carriers(lines):
     elves = _elves(lines)
     return sorted(elves, key=lambda e: e.total_calories, reverse=True)[:3]
 
 def top_three_total(lines):
-    top_carriers = top_three_carriers(lines)
-    return sum(map(lambda elf: elf.total_calories, top_carriers))
+    return top_k_total(lines, 3)
+
+
+def elf_totals_numpy(buffer):
+    """Total calories of every elf in the raw inventory `buffer`, parsed in
+    bulk with numpy. Lines are parsed all at once, one digit place at a
+    time from their (`rstrip`'d) end, and elves, the runs of lines ended by
+    a blank one, are summed with a segmented `np.add.reduceat`. Lines must
+    be made of at most 18 digits."""
+    import numpy as np
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) == 0:
+        return np.zeros(1, dtype=np.int64)
+    ends = np.flatnonzero(data == ord('\n'))
+    if data[-1] != ord('\n'):
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+
+    while True:
+        last = data[ends - 1]
+        trailing = (ends > starts) & ((last == ord(' ')) | ((last >= ord('\t')) & (last <= ord('\r'))))
+        if not trailing.any():
+            break
+        ends[trailing] -= 1
+    lengths = ends - starts
+    if lengths.max() > 18:
+        raise ValueError('Calories ledger has numbers too large for int64')
+    filled = lengths > 0
+    inside = np.zeros(len(data) + 1, dtype=np.int8)
+    inside[starts[filled]] = 1
+    inside[ends[filled]] = -1
+    inside = np.cumsum(inside[:-1], dtype=np.int8).astype(bool)
+    if ((data < ord('0')) | (data > ord('9')))[inside].any():
+        raise ValueError('Calories ledger has lines that are not numbers')
+
+    line_values = np.zeros(len(ends), dtype=np.int64)
+    for place in range(int(lengths.max())):
+        digits = data[ends - 1 - place] - np.uint8(ord('0'))
+        digits[lengths <= place] = 0
+        line_values += digits * np.int64(10 ** place)
+
+    elf_starts = np.concatenate(([0], np.flatnonzero(lengths == 0) + 1))
+    return np.add.reduceat(np.append(line_values, 0), elf_starts)
+
+def top_k_total_numpy(lines, k):
+    """Same as `top_k_total`, over the bytes of `lines` with numpy"""
+    import numpy as np
+    totals = elf_totals_numpy(read_bytes(lines))
+    k = min(k, len(totals))
+    return int(np.partition(totals, len(totals) - k)[len(totals) - k:].sum())
+
+def most_calories_carried_numpy(lines):
+    return top_k_total_numpy(lines, 1)
+
+def top_three_total_numpy(lines):
+    return top_k_total_numpy(lines, 3)
+
+
+def _range_elf_totals(buffer, start, end):
+    """Elf totals of a range cut by `split_ranges` right after a blank line.
+    But for the last range, that blank line is dropped, so it doesn't
+    count as one more, empty, elf."""
+    totals = elf_totals(iter_block_lines(buffer, start, end))
+    if end == len(buffer):
+        yield from totals
+        return
+    previous = next(totals)
+    for total in totals:
+        yield previous
+        previous = total
+
+def _map_ranges(lines, worker, *args, workers=None, parts=None):
+    """Results of `worker(filename, start, end, *args)` over ranges of the
+    input file cut at blank lines, from a pool of `workers` processes"""
+    from concurrent.futures import ProcessPoolExecutor
+    import mmap
+    filename = plain_filename(lines)
+    workers = workers or os.cpu_count()
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        separator = b'\r\n\r\n' if buffer.find(b'\r\n', 0, 4096) != -1 else b'\n\n'
+        ranges = split_ranges(buffer, parts or 4 * workers, separator)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, filename, start, end, *args) for start, end in ranges]
+        return [future.result() for future in futures]
+
+def _mappable(lines):
+    filename = plain_filename(lines)
+    return filename is not None and os.path.getsize(filename) > 0
+
+def _top_k_of_range(filename, start, end, k):
+    import mmap
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return top_k(_range_elf_totals(buffer, start, end), k)
+
+def top_k_total_parallel(lines, k, workers=None, parts=None):
+    """Same as `top_k_total`, splitting the input file into `parts` byte
+    ranges at blank lines, so every elf lies within a single range, and
+    computing the top `k` of each range in a pool of `workers` processes.
+    Workers map the file themselves: only offsets and top `k`s are sent
+    around. Falls back to `top_k_total` for inputs that can't be mapped."""
+    if not _mappable(lines):
+        return top_k_total(lines, k)
+    partials = _map_ranges(lines, _top_k_of_range, k, workers=workers, parts=parts)
+    return sum(top_k(itertools.chain.from_iterable(partials), k))
+
+def most_calories_carried_parallel(lines):
+    return top_k_total_parallel(lines, 1)
+
+def top_three_total_parallel(lines):
+    return top_k_total_parallel(lines, 3)
+
+
+def calorie_sketch(lines, k=200, seed=None):
+    """`KLL` sketch of the elf totals, to query their distribution in
+    bounded memory"""
+    from advent2022.sketch import KLL
+    sketch = KLL(k, seed=seed)
+    for total in elf_totals(lines):
+        sketch.update(total)
+    return sketch
+
+def _sketch_of_range(filename, start, end, k, seed):
+    import mmap
+    from advent2022.sketch import KLL
+    sketch = KLL(k, seed=seed)
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        for total in _range_elf_totals(buffer, start, end):
+            sketch.update(total)
+    return sketch
+
+def calorie_sketch_parallel(lines, k=200, seed=None, workers=None, parts=None):
+    """Same as `calorie_sketch`, merging the sketches of ranges of the input
+    file computed in a pool of `workers` processes"""
+    from advent2022.sketch import KLL
+    if not _mappable(lines):
+        return calorie_sketch(lines, k, seed=seed)
+    partials = _map_ranges(lines, _sketch_of_range, k, seed, workers=workers, parts=parts)
+    sketch = KLL(k, seed=seed)
+    for partial in partials:
+        sketch.merge(partial)
+    return sketch
+
+def calorie_quantiles(lines, qs=(0.5, 0.9, 0.99), k=200):
+    """Approximate quantiles `qs` of the elf totals, within the sketch
+    `error_bound` in rank"""
+    return calorie_sketch(lines, k).quantiles(qs)
+
+
+def ranked_elves(lines, run_size=1 << 20, fan_in=64, directory=None):
+    """Yields `(rank, elf, total)` for every elf, from the one carrying the
+    most calories down, ties in inventory order. The totals are sorted
+    externally, so only `run_size` of them are ever kept in memory."""
+    from advent2022.external import external_sorted
+    pairs = ((-total, elf) for elf, total in enumerate(elf_totals(lines)))
+    ranked = external_sorted(pairs, run_size=run_size, fan_in=fan_in, directory=directory)
+    for rank, (negative_total, elf) in enumerate(ranked, 1):
+        yield rank, elf, -negative_total
+
+
+class Follower:
+    """Top `k` total over a ledger that keeps being appended to. Each
+    `refresh` reads only the bytes appended since the previous one, from
+    `offset`, carrying over the running total of the last elf, which may
+    still be open, and the top `k` of the elves already closed. A trailing
+    line without its newline is left for the next refresh, and a ledger
+    that shrank is read again from the start."""
+
+    BLOCK = 1 << 24
+
+    def __init__(self, filename, k=3, offset=0, open_total=0, top=()):
+        self.filename = str(filename)
+        self.k = k
+        self.offset = offset
+        self.open_total = open_total
+        self.top = list(top)
+        heapq.heapify(self.top)
+
+    @property
+    def total(self):
+        return sum(top_k([*self.top, self.open_total], self.k))
+
+    def refresh(self):
+        if os.path.getsize(self.filename) < self.offset:
+            self.offset, self.open_total, self.top = 0, 0, []
+        with open(self.filename, 'rb') as f:
+            f.seek(self.offset)
+            pending = b''
+            while block := f.read(self.BLOCK):
+                block = pending + block
+                complete = block.rfind(b'\n') + 1
+                self._consume(block[:complete])
+                self.offset += complete
+                pending = block[complete:]
+        return self.total
+
+    def _consume(self, data):
+        for line in data.splitlines():
+            if len(line.rstrip()) == 0:
+                keep_top(self.top, self.open_total, self.k)
+                self.open_total = 0
+            else:
+                self.open_total += int(line)
+
+    def to_dict(self):
+        return {
+            'filename': self.filename,
+            'k': self.k,
+            'offset': self.offset,
+            'open_total': self.open_total,
+            'top': self.top,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
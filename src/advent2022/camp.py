@@ -1,4 +1,5 @@
 from utils import get_logger
+from advent2022.cache import cached
 
 from collections import namedtuple
 
@@ -73,6 +74,7 @@ class Pair(namedtuple('Pair', 'left right')):
         return self.left.intersect(self.right) != Range.EMPTY
 
 
+@cached()
 def pair_elves(lines):
     return [Pair.from_line(line) for line in lines]
 
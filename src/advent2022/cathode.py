@@ -5,6 +5,7 @@ import math
 import enum
 
 from utils import get_logger, flatten
+from advent2022.cache import cached
 log = get_logger(__name__)
 
 
@@ -57,6 +58,7 @@ def sentinel(name):
         (object, ),
         {
             "__repr__": __str__,
+            "__reduce__": lambda self: name,
         })
     return sentinel_type()
 
@@ -73,6 +75,7 @@ def parse_instruction(line):
             raise NotImplementedError('Unknown token {line}'.format(line=line))
 
 
+@cached()
 def read_program(lines):
     return [parse_instruction(line) for line in lines]
 
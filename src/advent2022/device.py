@@ -1,5 +1,6 @@
 from collections import namedtuple, deque
-from utils import get_logger
+from utils import get_logger, trace
+from advent2022.cache import cached
 log = get_logger(__name__)
 
 
@@ -69,6 +70,7 @@ class FilesystemBuilder:
         self.building = False
 
     def apply(self, command):
+        trace(log, 'Applying %r', command)
         match command:
             case Command("cd", [dir_name, *rest]):
                 self._change_dir(dir_name)
@@ -77,7 +79,7 @@ class FilesystemBuilder:
             case Output(raw=raw):
                 self._build(raw)
             case _:
-                log.warning(f'Unable to apply {command=}')
+                log.warning('Unable to apply command=%r', command)
 
     def _build(self, raw):
         match raw.split():
@@ -86,7 +88,7 @@ class FilesystemBuilder:
             case [size, name]:
                 self._build_file(name, size)
             case _:
-                log.warning(f'Unable to build {raw=}')
+                log.warning('Unable to build raw=%r', raw)
 
     def _build_dir(self, dir_name):
         new_dir = Dir(dir_name)
@@ -115,6 +117,7 @@ class FilesystemBuilder:
     def root(self):
         return self._visited_dirs[0]
 
+@cached()
 def filesystem(lines):
     commands = read_terminal(lines)
     fsb = FilesystemBuilder()
@@ -0,0 +1,75 @@
+"""External sort.
+
+Sorts streams of integer pairs that don't fit in memory. Sorted runs of at
+most `run_size` pairs are spilled to temporary files as packed `array('q')`
+records, then merged `fan_in` runs at a time, reading each one back in
+blocks, so that memory stays bounded however long the stream is.
+"""
+
+from array import array
+import heapq
+import itertools
+from pathlib import Path
+import tempfile
+
+from utils import get_logger
+log = get_logger(__name__)
+
+BLOCK = 1 << 12
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def write_run(pairs, path):
+    block = array('q')
+    with open(path, 'wb') as f:
+        for pair in pairs:
+            block.extend(pair)
+            if len(block) >= 2 * BLOCK:
+                block.tofile(f)
+                del block[:]
+        block.tofile(f)
+    return path
+
+def read_run(path):
+    with open(path, 'rb') as f:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(f, 2 * BLOCK)
+            except EOFError:
+                yield from zip(block[::2], block[1::2])
+                return
+            yield from zip(block[::2], block[1::2])
+
+def external_sorted(pairs, run_size=1 << 20, fan_in=64, directory=None):
+    """Iterates over `pairs` in order, keeping at most `run_size` of them in
+    memory plus a block of each of the `fan_in` runs being merged"""
+    if run_size < 1:
+        raise ValueError(f'Runs must hold at least one pair, not {run_size}')
+    if fan_in < 2:
+        raise ValueError(f'Merges must take at least two runs, not {fan_in}')
+    return _external_sorted(pairs, run_size, fan_in, directory)
+
+def _external_sorted(pairs, run_size, fan_in, directory):
+    chunked = chunks(pairs, run_size)
+    first = sorted(next(chunked, []))
+    if len(first) < run_size:
+        yield from first
+        return
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        paths = (Path(tmp) / f'{n}.run' for n in itertools.count())
+        runs = [write_run(first, next(paths))]
+        del first
+        runs.extend(write_run(sorted(chunk), next(paths)) for chunk in chunked)
+        log.info('Spilled %d runs of %d pairs', len(runs), run_size)
+        while len(runs) > fan_in:
+            merged = []
+            for group in chunks(runs, fan_in):
+                merged.append(write_run(heapq.merge(*map(read_run, group)), next(paths)))
+                for path in group:
+                    path.unlink()
+            runs = merged
+        yield from heapq.merge(*map(read_run, runs))
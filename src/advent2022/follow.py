@@ -0,0 +1,50 @@
+"""Follow mode.
+
+Keeps the calories top `k` total of a ledger that is being appended to up
+to date, printing it after every refresh. Each refresh only reads what was
+appended since the previous one. With `--state` the position is saved to a
+file, so separate runs (from cron, say) carry on where the last one
+stopped; with `--interval` it keeps refreshing until interrupted.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from utils import get_logger
+log = get_logger(__name__)
+
+from advent2022.calories import Follower
+
+
+def load_follower(filename, k, state_file=None):
+    if state_file is not None and Path(state_file).exists():
+        state = json.loads(Path(state_file).read_text())
+        if state['filename'] == str(filename) and state['k'] == k:
+            return Follower.from_dict(state)
+        log.warning('Ignoring state in %s: it follows another ledger', state_file)
+    return Follower(filename, k=k)
+
+
+def save_follower(follower, state_file):
+    Path(state_file).write_text(json.dumps(follower.to_dict()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='advent2022 follow')
+    parser.add_argument('ledger', help='calories ledger being appended to')
+    parser.add_argument('-k', type=int, default=3, help='elves to total')
+    parser.add_argument('--state', help='file where the position is kept between runs')
+    parser.add_argument('--interval', type=float,
+                        help='refresh every this many seconds, instead of once')
+    args = parser.parse_args(argv)
+
+    follower = load_follower(args.ledger, args.k, args.state)
+    while True:
+        print(f'result: {follower.refresh()}', flush=True)
+        if args.state:
+            save_follower(follower, args.state)
+        if args.interval is None:
+            return 0
+        time.sleep(args.interval)
@@ -1,5 +1,6 @@
 from collections import namedtuple
 from utils import get_logger
+from advent2022.cache import cached
 log = get_logger(__name__)
 
 Index = namedtuple('Index', 'i j')
@@ -96,6 +97,7 @@ class HeightMap(dict):
     def visible_trees(self):
         return [t for t in self.values() if t.visible(self)]
 
+@cached()
 def height_map(lines):
     return HeightMap.from_lines(lines)
 
@@ -0,0 +1,215 @@
+"""Synthetic inputs.
+
+One generator per day, producing a valid puzzle input at a requested
+`scale` from a seeded `random.Random`, so the same arguments always give
+the same input. Generators yield text pieces that `generate` writes in
+batches, so inputs of any size are streamed to disk without being built
+in memory.
+
+What `scale` counts depends on the day: elves, rounds, groups of three
+rucksacks, pairs, moves, characters, directories, grid side, motions,
+instructions or monkeys.
+"""
+
+import argparse
+import random
+import string
+import sys
+
+from utils import get_logger
+log = get_logger(__name__)
+
+BATCH = 4096
+
+
+def calories(scale, rng):
+    for i in range(scale):
+        if i > 0:
+            yield '\n'
+        for _ in range(rng.randint(1, 8)):
+            yield f'{rng.randint(1000, 60000)}\n'
+
+
+def rock(scale, rng):
+    for _ in range(scale):
+        yield f'{rng.choice("ABC")} {rng.choice("XYZ")}\n'
+
+
+def rucksacks(scale, rng):
+    """Each group shares exactly one badge, and each rucksack exactly one
+    item between its compartments: the badge and the three elves' own
+    item pools are disjoint"""
+    letters = list(string.ascii_letters)
+    for _ in range(scale):
+        rng.shuffle(letters)
+        badge, pools = letters[0], (letters[1:18], letters[18:35], letters[35:52])
+        for pool in pools:
+            common, left_only, right_only = pool[0], pool[1:9], pool[9:17]
+            half = rng.randint(4, 16)
+            left = [common, badge] + rng.choices(left_only, k=half - 2)
+            right = [common] + rng.choices(right_only, k=half - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            yield ''.join(left + right) + '\n'
+
+
+def camp(scale, rng):
+    for _ in range(scale):
+        a, b = sorted(rng.randint(1, 99) for _ in range(2))
+        c, d = sorted(rng.randint(1, 99) for _ in range(2))
+        yield f'{a}-{b},{c}-{d}\n'
+
+
+SUPPLY_STACKS = 9
+
+def supply(scale, rng):
+    heights = [rng.randint(1, 40) for _ in range(SUPPLY_STACKS)]
+    for level in reversed(range(max(heights))):
+        row = ' '.join(
+            f'[{rng.choice(string.ascii_uppercase)}]' if height > level else '   '
+            for height in heights
+        )
+        yield row.rstrip() + '\n'
+    yield ' ' + '   '.join(str(n + 1) for n in range(SUPPLY_STACKS)) + '\n'
+    yield '\n'
+    for _ in range(scale):
+        from_ = rng.choice([n for n, height in enumerate(heights) if height > 0])
+        to_ = rng.choice([n for n in range(SUPPLY_STACKS) if n != from_])
+        qty = rng.randint(1, min(heights[from_], 5))
+        heights[from_] -= qty
+        heights[to_] += qty
+        yield f'move {qty} from {from_ + 1} to {to_ + 1}\n'
+
+
+TUNING_MARKER = 'defghijklmnopq'
+
+def tuning(scale, rng):
+    """A datastream without any marker until its last 14 characters. The
+    marker is preceded by its own first letter, so no window overlapping
+    the noise before it is a marker"""
+    noise = max(scale, len(TUNING_MARKER) + 1) - len(TUNING_MARKER) - 1
+    while noise > 0:
+        size = min(noise, BATCH)
+        yield ''.join(rng.choices('abc', k=size))
+        noise -= size
+    yield TUNING_MARKER[0] + TUNING_MARKER + '\n'
+
+
+DEVICE_MAX_DEPTH = 100
+DEVICE_DISK_SPACE = 70_000_000
+
+def device(scale, rng):
+    """Transcript of a depth first exploration of about `scale` directories
+    with 1 to 3 files each. As in real inputs, the files take between 40M
+    and 70M of the disk, so an update needs some directory deleted: their
+    sizes average a used space picked at random over the expected number of
+    files, and are cut short to never fill the disk."""
+    mean_file_size = rng.randint(50_000_000, 60_000_000) // (2 * scale)
+    room = DEVICE_DISK_SPACE - 1
+    budget = scale - 1
+
+    def listing(depth):
+        nonlocal budget, room
+        children = 0 if depth >= DEVICE_MAX_DEPTH else min(budget, rng.choice((1, 1, 2, 3)))
+        budget -= children
+        names = [f'd{i}' for i in range(children)]
+        yield '$ ls\n'
+        for name in names:
+            yield f'dir {name}\n'
+        for i in range(rng.randint(1, 3)):
+            size = min(room, rng.randint(mean_file_size // 2, mean_file_size * 3 // 2) or 1)
+            if size == 0:
+                break
+            room -= size
+            yield f'{size} f{i}.txt\n'
+        return names
+
+    yield '$ cd /\n'
+    pending = [(yield from listing(0))]
+    while pending:
+        if pending[-1]:
+            name = pending[-1].pop()
+            yield f'$ cd {name}\n'
+            pending.append((yield from listing(len(pending))))
+        else:
+            pending.pop()
+            if pending:
+                yield '$ cd ..\n'
+
+
+def forest(scale, rng):
+    for _ in range(scale):
+        yield ''.join(rng.choices(string.digits, k=scale)) + '\n'
+
+
+def bridge(scale, rng):
+    for _ in range(scale):
+        yield f'{rng.choice("RULD")} {rng.randint(1, 20)}\n'
+
+
+def cathode(scale, rng):
+    for _ in range(scale):
+        if rng.random() < 0.3:
+            yield 'noop\n'
+        else:
+            yield f'addx {rng.randint(-15, 15)}\n'
+
+
+MONKEY_DIVISORS = (2, 3, 5, 7, 11, 13, 17, 19, 23)
+
+def monkeys(scale, rng):
+    count = max(scale, 2)
+    for name in range(count):
+        others = [n for n in range(count) if n != name]
+        items = ', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        if name > 0:
+            yield '\n'
+        yield f'Monkey {name}:\n'
+        yield f'  Starting items: {items}\n'
+        yield f'  Operation: new = old {rng.choice("*+")} {rng.randint(2, 19)}\n'
+        yield f'  Test: divisible by {rng.choice(MONKEY_DIVISORS)}\n'
+        yield f'    If true: throw to monkey {rng.choice(others)}\n'
+        yield f'    If false: throw to monkey {rng.choice(others)}\n'
+
+
+GENERATORS = {
+    1: calories,
+    2: rock,
+    3: rucksacks,
+    4: camp,
+    5: supply,
+    6: tuning,
+    7: device,
+    8: forest,
+    9: bridge,
+    10: cathode,
+    11: monkeys,
+}
+
+
+def generate(day, out, scale, seed=0):
+    """Writes the input for `day` at `scale` to the text stream `out`"""
+    pieces = GENERATORS[int(day)](scale, random.Random(seed))
+    batch = []
+    for piece in pieces:
+        batch.append(piece)
+        if len(batch) == BATCH:
+            out.write(''.join(batch))
+            batch = []
+    out.write(''.join(batch))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='advent2022 generate')
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('--scale', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-', help='file to write, - for stdout')
+    args = parser.parse_args(argv)
+
+    if args.output == '-':
+        generate(args.day, sys.stdout, args.scale, seed=args.seed)
+    else:
+        with open(args.output, 'w') as out:
+            generate(args.day, out, args.scale, seed=args.seed)
+    return 0
@@ -0,0 +1,78 @@
+"""Import time report.
+
+Imports modules in a fresh interpreter under `python -X importtime` and
+summarises what it reports: the total time to import each module and the
+imports that took longest by themselves. Run it to keep the cold start of
+the CLI in check as days are added.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from utils import get_logger
+log = get_logger(__name__)
+
+from advent2022.solvers import SOLVERS
+
+ImportTime = namedtuple('ImportTime', 'name self_us cumulative_us')
+
+_SRC = Path(__file__).resolve().parents[1]
+
+CLI_MODULES = ('advent2022.__main__', )
+
+
+def parse_importtime(stderr):
+    """Parses the `-X importtime` lines of `stderr`"""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def import_times(module):
+    """Times of every import done, in a fresh interpreter, to import `module`"""
+    pythonpath = os.pathsep.join(filter(None, [str(_SRC), os.environ.get('PYTHONPATH')]))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONPATH': pythonpath},
+    )
+    return parse_importtime(proc.stderr)
+
+
+def total_us(module, times):
+    return next(t.cumulative_us for t in reversed(times) if t.name == module)
+
+
+def report(modules, top=10):
+    rows = [f'{"module":<32}{"total ms":>10}']
+    slowest = {}
+    for module in modules:
+        times = import_times(module)
+        rows.append(f'{module:<32}{total_us(module, times) / 1000:>10.2f}')
+        for t in times:
+            slowest[t.name] = max(t.self_us, slowest.get(t.name, 0))
+    rows.append('')
+    rows.append(f'{"slowest imports (self)":<32}{"ms":>10}')
+    for name, self_us in sorted(slowest.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        rows.append(f'{name:<32}{self_us / 1000:>10.2f}')
+    return '\n'.join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='advent2022 importtime')
+    parser.add_argument('modules', nargs='*',
+                        help='modules to time, by default the CLI and every day')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    days = list(dict.fromkeys(module for module, _ in SOLVERS.values()))
+    print(report(args.modules or [*CLI_MODULES, *days], top=args.top))
+    return 0
@@ -7,6 +7,7 @@ import typing
 import re
 
 from utils import get_logger, flatten
+from advent2022.cache import cached
 log = get_logger(__name__)
 
 def is_blank(line):
@@ -157,6 +158,7 @@ class Troop(dict):
         first, second = activity[:2]
         return first * second
 
+@cached()
 def monkeys(lines):
     mks = []
     monkey_lines = []
@@ -0,0 +1,75 @@
+"""Solver profiling.
+
+`profile_cpu` runs a solver under cProfile, dumps the stats to a `.pstats`
+file (for `python -m pstats`, snakeviz...) and reports the top functions by
+cumulative time. `profile_mem` runs it under tracemalloc and reports the
+peak traced memory and the top allocation sites. The snapshot is taken as
+the solver returns, while its locals (typically the parsed model) are
+still alive.
+"""
+
+import cProfile
+import pstats
+import sys
+import tracemalloc
+
+from utils import get_logger
+log = get_logger(__name__)
+
+
+def profile_cpu(fn, *args, output='profile.pstats', top=20, stream=None):
+    stream = sys.stderr if stream is None else stream
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+    profiler.dump_stats(output)
+    print(f'cProfile stats written to {output}', file=stream)
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return result
+
+
+def _snapshot_on_return(fn, *args):
+    """Calls `fn` and takes a tracemalloc snapshot right when it returns"""
+    code = getattr(fn, '__code__', None)
+    snapshots = []
+
+    def on_return(frame, event, arg):
+        if event == 'return' and frame.f_code is code and not snapshots:
+            snapshots.append(tracemalloc.take_snapshot())
+
+    previous = sys.getprofile()
+    sys.setprofile(on_return)
+    try:
+        result = fn(*args)
+    finally:
+        sys.setprofile(previous)
+    return result, snapshots[0] if snapshots else tracemalloc.take_snapshot()
+
+
+def profile_mem(fn, *args, top=20, frames=1, stream=None):
+    stream = sys.stderr if stream is None else stream
+    tracemalloc.start(frames)
+    try:
+        result, snapshot = _snapshot_on_return(fn, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    print(f'peak traced memory: {peak / 2**20:.2f} MiB', file=stream)
+    print(f'top {top} allocation sites alive when {fn.__name__} returned:', file=stream)
+    for stat in snapshot.statistics('lineno')[:top]:
+        print(f'  {stat}', file=stream)
+    return result
+
+
+def profile(kind, fn, *args, output='profile.pstats', top=20, stream=None):
+    match kind:
+        case 'cpu':
+            return profile_cpu(fn, *args, output=output, top=top, stream=stream)
+        case 'mem':
+            return profile_mem(fn, *args, top=top, stream=stream)
+        case _:
+            raise ValueError(f'Unknown profile kind: {kind}')
@@ -0,0 +1,32 @@
+"""Rank mode.
+
+Prints every elf of a calories ledger, from the one carrying the most
+calories down, as `rank elf total` lines. The ranking is sorted externally
+in runs of `--run-size` elves, so it works for ledgers larger than memory.
+"""
+
+import argparse
+
+from utils import read_input
+
+from advent2022.calories import ranked_elves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='advent2022 rank')
+    parser.add_argument('ledger', help='calories ledger to rank, - for stdin')
+    parser.add_argument('--run-size', type=int, default=1 << 20,
+                        help='elves sorted in memory at once')
+    parser.add_argument('--fan-in', type=int, default=64,
+                        help='sorted runs merged at once')
+    parser.add_argument('--tmpdir', help='directory for the sorted runs')
+    args = parser.parse_args(argv)
+    if args.run_size < 1:
+        parser.error('--run-size must be at least 1')
+    if args.fan_in < 2:
+        parser.error('--fan-in must be at least 2')
+
+    with read_input(args.ledger) as lines:
+        for rank, elf, total in ranked_elves(lines, args.run_size, args.fan_in, args.tmpdir):
+            print(rank, elf, total)
+    return 0
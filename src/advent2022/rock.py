@@ -1,5 +1,8 @@
-from collections import namedtuple
-from utils import get_logger
+from collections import namedtuple, Counter
+import functools
+import itertools
+import os
+from utils import get_logger, read_bytes, plain_filename, iter_block_lines, split_ranges
 
 log = get_logger(__name__)
 
@@ -83,9 +86,32 @@ class Round(namedtuple('Round', 'left right')):
         right_move = choose_right(left_move, result)
         return cls(left_move, right_move)
 
+LINES = [f'{left} {right}' for left in 'ABC' for right in 'XYZ']
+
+@functools.cache
+def score_table(line_round):
+    """Score of each of the 9 possible strategy lines, read by `line_round`"""
+    return {line: play_score(*line_round(line)) for line in LINES}
+
+def fold_scores(counts, line_round, table=None):
+    """Total score of the `counts` of every distinct line, against the
+    score `table` of `line_round`. Lines not in the table (e.g. with extra
+    whitespace) are scored by `line_round` itself, which rejects invalid
+    ones."""
+    table = score_table(line_round) if table is None else table
+    return sum(
+        count * (table[line] if line in table else play_score(*line_round(line)))
+        for line, count in counts.items()
+    )
+
+def line_counts(lines):
+    """Histogram of the lines of the guide, all the parsing scoring needs"""
+    return Counter(lines)
+
 def total_score(lines, line_round=Round.from_line):
-    rounds = [line_round(line) for line in lines]
-    return sum(play_score(*rund) for rund in rounds)
+    """Counts every distinct line once and folds the counts against the
+    score table"""
+    return fold_scores(line_counts(lines), line_round)
 
 def decode_result(right):
     RESULTS = {
@@ -111,3 +137,135 @@ def choose_right(left, result):
 
 def total_score_strategy_guide(lines):
     return total_score(lines, line_round=Round.from_line_right_drives_play)
+
+def shape_decoder(mapping):
+    """`line_round` reading the right column as the shape in `mapping`, as
+    in `{'X': Rock, 'Y': Paper, 'Z': Scissors}`"""
+    def line_round(line):
+        left, right = line.split()
+        return Round(decode(left), mapping[right])
+    return line_round
+
+def outcome_decoder(mapping):
+    """`line_round` reading the right column as the result for the right
+    player in `mapping`, as in `{'X': Lose, 'Y': Draw, 'Z': Win}`"""
+    def line_round(line):
+        left, right = line.split()
+        left_move = decode(left)
+        return Round(left_move, choose_right(left_move, mapping[right]))
+    return line_round
+
+DECODERS = (Round.from_line, Round.from_line_right_drives_play)
+
+def scores(lines, decoders=DECODERS):
+    """Total score of the guide read by each of `decoders`, in a single
+    pass over `lines`. By default, the scores of both puzzles."""
+    return fold_all(line_counts(lines), decoders)
+
+def fold_all(counts, decoders):
+    return tuple(
+        fold_scores(counts, decoder, {line: play_score(*decoder(line)) for line in LINES})
+        for decoder in decoders
+    )
+
+Mapping = namedtuple('Mapping', 'score kind mapping')
+
+def candidate_mappings():
+    """Every assignment of X, Y and Z to shapes and to outcomes"""
+    for shapes in itertools.permutations([Rock, Paper, Scissors]):
+        yield 'shape', dict(zip('XYZ', shapes))
+    for outcomes in itertools.permutations([Lose, Draw, Win]):
+        yield 'outcome', dict(zip('XYZ', outcomes))
+
+def best_mapping(lines):
+    """Every candidate mapping of the right column with the score it gets,
+    best first, from the histogram of a single pass over `lines`"""
+    MAKE_DECODER = {
+        'shape': shape_decoder,
+        'outcome': outcome_decoder,
+    }
+    candidates = list(candidate_mappings())
+    decoders = [MAKE_DECODER[kind](mapping) for kind, mapping in candidates]
+    totals = fold_all(line_counts(lines), decoders)
+    ranked = [Mapping(score, kind, mapping) for score, (kind, mapping) in zip(totals, candidates)]
+    return sorted(ranked, key=lambda m: m.score, reverse=True)
+
+def _count_range(filename, start, end):
+    import mmap
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return Counter(iter_block_lines(buffer, start, end))
+
+def scores_parallel(lines, decoders=DECODERS, workers=None, parts=None):
+    """Same as `scores`, counting the lines of newline aligned ranges of the
+    input file in a pool of `workers` processes. Workers map the file
+    themselves, so only offsets and line counts cross processes."""
+    from concurrent.futures import ProcessPoolExecutor
+    import mmap
+    filename = plain_filename(lines)
+    if filename is None or os.path.getsize(filename) == 0:
+        return scores(lines, decoders)
+    workers = workers or os.cpu_count()
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        ranges = split_ranges(buffer, parts or 4 * workers)
+    counts = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_count_range, filename, start, end) for start, end in ranges]
+        for future in futures:
+            for line, count in future.result().items():
+                counts[line.decode()] += count
+    return fold_all(counts, decoders)
+
+def total_score_parallel(lines):
+    return scores_parallel(lines, DECODERS[:1])[0]
+
+def total_score_strategy_guide_parallel(lines):
+    return scores_parallel(lines, DECODERS[1:])[0]
+
+
+def rounds_numpy(buffer):
+    """Opponent and own codes, 0 to 2, of every round in the raw strategy
+    guide `buffer`, viewed as fixed-stride rows of `"A X\\n"` (or
+    `"A X\\r\\n"`) bytes. Trailing whitespace at the end of the guide,
+    and so a missing final line ending, is ignored."""
+    import numpy as np
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    whitespace = (data == ord(' ')) | ((data >= ord('\t')) & (data <= ord('\r')))
+    if whitespace.all():
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    data = data[:len(data) - np.argmin(whitespace[::-1])]
+    ending = b'\r\n' if data[3:5].tobytes() == b'\r\n' else b'\n'
+    stride = 3 + len(ending)
+    if (len(data) + len(ending)) % stride != 0:
+        raise ValueError(f'Strategy guide is not made of {stride} byte lines')
+    separators = [data[1::stride] == ord(' ')]
+    separators += [data[3 + i::stride] == byte for i, byte in enumerate(ending)]
+    if not all(separator.all() for separator in separators):
+        raise ValueError(f'Strategy guide is not made of {stride} byte lines')
+    opponent = data[0::stride].astype(np.int64) - ord('A')
+    own = data[2::stride].astype(np.int64) - ord('X')
+    if ((opponent < 0) | (opponent > 2) | (own < 0) | (own > 2)).any():
+        raise ValueError('Strategy guide has unknown letters')
+    return opponent, own
+
+def total_score_numpy(lines):
+    """`total_score` over whole arrays: own shape scores 1 to 3 and the
+    outcome, 0 lose, 1 draw and 2 win, is `(own - opponent + 1) % 3`.
+    Guides that aren't fixed-stride (e.g. with trailing whitespace in some
+    lines) are scored by `total_score` instead."""
+    try:
+        opponent, own = rounds_numpy(read_bytes(lines))
+    except ValueError as e:
+        log.debug('Scoring the guide round by round: %s', e)
+        return total_score(lines)
+    return int((own + 1 + 3 * ((own - opponent + 1) % 3)).sum())
+
+def total_score_strategy_guide_numpy(lines):
+    """`total_score_strategy_guide` over whole arrays: own code is the
+    outcome and the shape that gets it is `(opponent + own - 1) % 3`.
+    Falls back to `total_score_strategy_guide` like `total_score_numpy`."""
+    try:
+        opponent, own = rounds_numpy(read_bytes(lines))
+    except ValueError as e:
+        log.debug('Scoring the guide round by round: %s', e)
+        return total_score_strategy_guide(lines)
+    return int(((opponent + own - 1) % 3 + 1 + 3 * own).sum())
@@ -1,7 +1,7 @@
 from collections import namedtuple
 import string
 
-from utils import get_logger, flatten
+from utils import get_logger, read_bytes
 log = get_logger(__name__)
 
 PRIORITIES = {
@@ -11,6 +11,24 @@ PRIORITIES.update({
     letter: i + 27 for i, letter in enumerate(string.ascii_uppercase)
 })
 
+BITS = {
+    letter: 1 << (priority - 1) for letter, priority in PRIORITIES.items()
+}
+
+def item_mask(items):
+    """Set of `items` as an int with bit `priority - 1` set for each one"""
+    return sum(map(BITS.__getitem__, set(items)))
+
+def mask_priorities(mask):
+    """Sum of the priorities of the items in `mask`, the indexes (from 1)
+    of its set bits"""
+    total = 0
+    while mask:
+        priority = mask.bit_length()
+        total += priority
+        mask ^= 1 << (priority - 1)
+    return total
+
 
 class Item(namedtuple('Item', 'raw')):
 
@@ -50,9 +68,12 @@ def halves(string):
 
 
 def sum_priorities_of_common_items(lines):
-    rucksacks = [Rucksack.from_line(line) for line in lines]
-    common_items = flatten(rucksak.common_items() for rucksak in rucksacks)
-    return sum(item.priority for item in common_items)
+    """Compartments are intersected as bitmasks, see `item_mask`"""
+    total = 0
+    for line in lines:
+        first, second = halves(line)
+        total += mask_priorities(item_mask(first) & item_mask(second))
+    return total
 
 class Badge(Item):
     pass
@@ -71,15 +92,25 @@ class Group(namedtuple('Group', 'badge')):
 
     @classmethod
     def from_elves(cls, *elves):
-        assert len(elves) == 3, f"Impossible to make a Group with {len(elves)} elves"
-        elf1, elf2, elf3 = elves
-        first_set = set(item for item in elf1.items)
-        second_set = set(item for item in elf2.items)
-        third_set = set(item for item in elf3.items)
-        badges = first_set.intersection(second_set).intersection(third_set)
-        assert len(badges) == 1, f"There are {len(badges)} identical items carried by the 3 elfs"
+        assert len(elves) > 0, "Impossible to make a Group with no elves"
+        first, *others = elves
+        badges = set(item for item in first.items)
+        for elf in others:
+            badges.intersection_update(elf.items)
+        assert len(badges) == 1, f"There are {len(badges)} identical items carried by the {len(elves)} elfs"
         return cls(Badge(badges.pop()))
 
+def groups_of(lines, n):
+    """Yields every `n` consecutive lines as they are read, checking at the
+    end that no partial group is left"""
+    group = []
+    for line in lines:
+        group.append(line)
+        if len(group) == n:
+            yield group
+            group = []
+    assert not group, f"Impossible to make groups of {n} elves each"
+
 class _ElfGrouper:
 
     def __init__(self, lines, n):
@@ -87,22 +118,89 @@ class _ElfGrouper:
         self.n = n
 
     def __iter__(self):
-        group = []
-        for line in self.lines:
-            group.append(Elf.from_line(line))
-            if len(group) == self.n:
-                yield Group.from_elves(*group)
-                group = []
+        for group in groups_of(self.lines, self.n):
+            yield Group.from_elves(*map(Elf.from_line, group))
 
 
 def group_elves(lines, n=3):
-    assert len(lines) % n == 0, f"Impossible to make groups of {n} elves each"
     return list(_ElfGrouper(lines, n=n))
 
 def sum_badges_priorities(*badges):
     return sum(badge.priority for badge in badges)
 
-def sum_priorities_elf_groups(lines):
-    groups = group_elves(lines)
-    badges = (group.badge for group in groups)
-    return sum_badges_priorities(*badges)
+def group_badge_mask(*elves):
+    """Badge of a group of elves' item lines, as a bitmask"""
+    badges = item_mask(elves[0])
+    for elf in elves[1:]:
+        badges &= item_mask(elf)
+    assert badges and not badges & (badges - 1), \
+        f"There are {badges.bit_count()} identical items carried by the {len(elves)} elfs"
+    return badges
+
+def sum_priorities_elf_groups(lines, n=3):
+    """Badges are found intersecting the items of every group of `n` elves
+    as bitmasks, in a single streaming pass over `lines`"""
+    return sum(mask_priorities(group_badge_mask(*group)) for group in groups_of(lines, n))
+
+
+def line_masks_numpy(buffer):
+    """Item masks, as in `item_mask`, of both halves of every line of the
+    raw manifest `buffer`, computed in bulk with numpy: every byte is
+    mapped to its item bit through a 256 entry table and the bits of each
+    half of the (`rstrip`'d) lines are or'ed with a segmented
+    `np.bitwise_or.reduceat`"""
+    import numpy as np
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    whitespace = (data == ord(' ')) | ((data >= ord('\t')) & (data <= ord('\r')))
+    if whitespace.all():
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+    data = data[:len(data) - np.argmin(whitespace[::-1])]
+
+    ends = np.append(np.flatnonzero(data == ord('\n')), len(data))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    while True:
+        trailing = (ends > starts) & whitespace[np.maximum(ends - 1, 0)]
+        if not trailing.any():
+            break
+        ends[trailing] -= 1
+    lengths = ends - starts
+    assert not (lengths % 2).any(), "Can't halve an odd string"
+
+    table = np.zeros(256, dtype=np.uint64)
+    for letter, bit in BITS.items():
+        table[ord(letter)] = bit
+    bits = np.append(table[data], np.uint64(0))
+    filled = lengths > 0
+    inside = np.zeros(len(data) + 1, dtype=np.int8)
+    inside[starts[filled]] = 1
+    inside[ends[filled]] = -1
+    inside = np.cumsum(inside[:-1], dtype=np.int8).astype(bool)
+    assert (bits[:-1] != 0)[inside].all(), "Unknown items in the manifest"
+
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = starts + lengths // 2
+    halves_masks = np.bitwise_or.reduceat(bits, bounds)
+    return halves_masks[0::2], halves_masks[1::2]
+
+def mask_priorities_numpy(masks):
+    """`mask_priorities` summed over the array `masks`"""
+    import numpy as np
+    total = 0
+    for bit in range(len(BITS)):
+        total += (bit + 1) * int(np.count_nonzero(masks & np.uint64(1 << bit)))
+    return total
+
+def sum_priorities_of_common_items_numpy(lines):
+    first, second = line_masks_numpy(read_bytes(lines))
+    return mask_priorities_numpy(first & second)
+
+def sum_priorities_elf_groups_numpy(lines, n=3):
+    import numpy as np
+    first, second = line_masks_numpy(read_bytes(lines))
+    elves = first | second
+    assert len(elves) % n == 0, f"Impossible to make groups of {n} elves each"
+    badges = np.bitwise_and.reduce(elves.reshape(-1, n), axis=1)
+    assert ((badges != 0) & (badges & (badges - np.uint64(1)) == 0)).all(), \
+        f"There are groups without a single identical item carried by the {n} elfs"
+    return mask_priorities_numpy(badges)
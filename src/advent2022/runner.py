@@ -0,0 +1,107 @@
+"""Batch runner.
+
+Runs a selection of `SOLVERS` across a process pool and streams one JSON
+line per solver with its result, wall time and CPU time. Each day is a
+single task, so its input is read once and shared by the day's puzzles.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils import get_logger, read_input
+log = get_logger(__name__)
+
+from advent2022 import cache
+from advent2022.solvers import SOLVERS, ENGINES, solver
+
+
+def parse_selection(spec):
+    """Parses selections such as `1-11` or `1,2,5-7` into a list of ints"""
+    selected = []
+    for part in spec.split(','):
+        first, _, last = part.partition('-')
+        selected.extend(range(int(first), int(last or first) + 1))
+    return selected
+
+
+def _timed(fn, *args):
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = fn(*args)
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def run_day(day, puzzles, use_cache=True, engine=None):
+    """Solves `puzzles` for `day` over a single read of its input"""
+    with cache.using(use_cache):
+        return _run_day(day, puzzles, engine)
+
+
+def _run_day(day, puzzles, engine):
+    try:
+        lines, read_wall, _ = _timed(lambda: read_input(day).read())
+    except Exception as e:
+        return [{'day': day, 'puzzle': puzzle, 'error': repr(e)} for puzzle in puzzles]
+
+    records = []
+    for puzzle in puzzles:
+        record = {'day': day, 'puzzle': puzzle, 'read': read_wall}
+        stdout = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                result, wall, cpu = _timed(solver(day, puzzle, engine), lines)
+            record.update(result=result, wall=wall, cpu=cpu)
+        except Exception as e:
+            record['error'] = repr(e)
+        if stdout.getvalue():
+            record['stdout'] = stdout.getvalue()
+        records.append(record)
+    return records
+
+
+def selected_solvers(days, puzzles, engine=None):
+    """Groups the existing solvers (of `engine`) among `days` and `puzzles`
+    by day"""
+    solvers = SOLVERS if engine is None else ENGINES[engine]
+    selection = {}
+    for day in days:
+        for puzzle in puzzles:
+            if f'{day}_{puzzle}' in solvers:
+                selection.setdefault(day, []).append(puzzle)
+    return selection
+
+
+def run_all(days, puzzles, workers=None, use_cache=True, engine=None):
+    """Yields the record of every selected solver as soon as its day is done"""
+    selection = selected_solvers(days, puzzles, engine)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_day, day, day_puzzles, use_cache, engine)
+            for day, day_puzzles in selection.items()
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='advent2022 run-all')
+    parser.add_argument('--days', default='1-25', help='e.g. 1-11 or 1,3,5-7')
+    parser.add_argument('--puzzles', default='1,2', help='e.g. 1,2')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--engine', choices=sorted(ENGINES),
+                        help='run only the puzzles this engine solves, with it')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse the inputs again, ignoring cached models')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for record in run_all(parse_selection(args.days), parse_selection(args.puzzles),
+                          workers=args.workers, use_cache=not args.no_cache,
+                          engine=args.engine):
+        failed = failed or 'error' in record
+        print(json.dumps(record, default=str), flush=True)
+    return 1 if failed else 0
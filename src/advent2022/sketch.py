@@ -0,0 +1,106 @@
+"""Quantile sketch.
+
+`KLL` summarises a stream of n numbers in O(k log(n/k)) memory and answers
+rank and quantile queries about it (Karnin, Lang and Liberty, "Optimal
+Quantile Approximation in Streams", 2016). Items are kept in compactors of
+increasing weight: when a compactor fills up it is sorted and every other
+item, picking odd or even at random, moves up a level with twice the
+weight. Sketches of parts of a stream merge into a sketch of all of it,
+with the same guarantee.
+"""
+
+import math
+import random
+
+
+class KLL:
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.size = 0
+        self.compactors = [[]]
+        self._rng = random.Random(seed)
+        self._max_size = self._capacity(0)
+
+    @property
+    def error_bound(self):
+        """Normalized rank error: with 99% confidence, the rank of any value
+        is right within `error_bound * n` (empirical bound for KLL sketches
+        with compaction factor 2/3, as published by Apache DataSketches)"""
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return math.ceil(self.k * (2 / 3) ** depth) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self):
+        for height, compactor in enumerate(self.compactors):
+            if len(compactor) < self._capacity(height):
+                continue
+            if height + 1 == len(self.compactors):
+                self._grow()
+            compactor.sort()
+            kept = len(compactor) % 2
+            self.compactors[height + 1].extend(compactor[kept + self._rng.randrange(2)::2])
+            del compactor[kept:]
+            self.size = sum(len(c) for c in self.compactors)
+            if self.size < self._max_size:
+                break
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.n += 1
+        self.size += 1
+        if self.size >= self._max_size:
+            self._compress()
+
+    def merge(self, other):
+        """Adds the stream summarised by `other` to this sketch"""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for compactor, others in zip(self.compactors, other.compactors):
+            compactor.extend(others)
+        self.n += other.n
+        self.size = sum(len(c) for c in self.compactors)
+        while self.size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self):
+        return sorted(
+            (value, 1 << height)
+            for height, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+
+    def rank(self, value):
+        """Approximate number of items <= `value`"""
+        return sum(weight for item, weight in self._weighted() if item <= value)
+
+    def quantiles(self, qs):
+        """Approximate values at each of the fractions `qs` of the stream"""
+        if self.n == 0:
+            raise ValueError('Empty sketch has no quantiles')
+        weighted = self._weighted()
+        values = []
+        for q in qs:
+            target, cumulative = q * self.n, 0
+            for item, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    break
+            values.append(item)
+        return values
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def histogram(self, edges):
+        """Approximate number of items in each `(edges[i], edges[i + 1]]`"""
+        ranks = [self.rank(edge) for edge in edges]
+        return [upper - lower for lower, upper in zip(ranks, ranks[1:])]
@@ -0,0 +1,70 @@
+"""Solver registry.
+
+Maps `'day_puzzle'` keys to the module and function solving them, so
+dispatching a solver only imports the module of its day. `ENGINES` maps
+alternative engines to the puzzles they can solve, with the same answers.
+"""
+
+import importlib
+
+from utils import get_logger
+
+log = get_logger(__name__)
+
+SOLVERS = {
+    '1_1': ('advent2022.calories', 'most_calories_carried'),
+    '1_2': ('advent2022.calories', 'top_three_total'),
+    '2_1': ('advent2022.rock', 'total_score'),
+    '2_2': ('advent2022.rock', 'total_score_strategy_guide'),
+    '3_1': ('advent2022.rucksacks', 'sum_priorities_of_common_items'),
+    '3_2': ('advent2022.rucksacks', 'sum_priorities_elf_groups'),
+    '4_1': ('advent2022.camp', 'count_pairs_with_overlapping_ranges'),
+    '4_2': ('advent2022.camp', 'count_pairs_with_some_overlapping_ranges'),
+    '5_1': ('advent2022.supply', 'top_crates_9000'),
+    '5_2': ('advent2022.supply', 'top_crates_9001'),
+    '6_1': ('advent2022.tuning', 'start_of_packet'),
+    '6_2': ('advent2022.tuning', 'start_of_message'),
+    '7_1': ('advent2022.device', 'sum_dirs_with_at_most_100000'),
+    '7_2': ('advent2022.device', 'smallest_dir_to_delte_size'),
+    '8_1': ('advent2022.forest', 'count_visible_trees'),
+    '8_2': ('advent2022.forest', 'max_scenic_score'),
+    '9_1': ('advent2022.bridge', 'positions_tail_visited_at_least_once'),
+    '9_2': ('advent2022.bridge', 'positions_tail_visited_at_least_once_long_rope'),
+    '10_1': ('advent2022.cathode', 'sum_20_and_40s_strengths'),
+    '10_2': ('advent2022.cathode', 'print_crt'),
+    '11_1': ('advent2022.monkeys', 'monkey_business'),
+}
+
+ENGINES = {
+    'numpy': {
+        '1_1': ('advent2022.calories', 'most_calories_carried_numpy'),
+        '1_2': ('advent2022.calories', 'top_three_total_numpy'),
+        '2_1': ('advent2022.rock', 'total_score_numpy'),
+        '2_2': ('advent2022.rock', 'total_score_strategy_guide_numpy'),
+        '3_1': ('advent2022.rucksacks', 'sum_priorities_of_common_items_numpy'),
+        '3_2': ('advent2022.rucksacks', 'sum_priorities_elf_groups_numpy'),
+    },
+    'parallel': {
+        '1_1': ('advent2022.calories', 'most_calories_carried_parallel'),
+        '1_2': ('advent2022.calories', 'top_three_total_parallel'),
+        '2_1': ('advent2022.rock', 'total_score_parallel'),
+        '2_2': ('advent2022.rock', 'total_score_strategy_guide_parallel'),
+    },
+}
+
+
+def load(entry):
+    """Imports the `(module, name)` of a registry entry and returns it"""
+    module, name = entry
+    return getattr(importlib.import_module(module), name)
+
+
+def solver(day, puzzle, engine=None):
+    solvers = SOLVERS if engine is None else ENGINES[engine]
+    try:
+        return load(solvers[f'{day}_{puzzle}'])
+    except KeyError as e:
+        log.error('Solver for day=%r and puzzle=%r not found (engine=%s)', day, puzzle, engine)
+        raise e
+    except Exception as e:
+        raise e
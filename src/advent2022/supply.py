@@ -4,6 +4,8 @@ import string
 from utils import get_logger
 log = get_logger(__name__)
 
+from advent2022.cache import cached
+
 def _is_move(line):
     return line.startswith('move')
 
@@ -125,10 +127,10 @@ def _flatten(list_of_lists):
                      for item in inner_list]
 
 
-def read_crane(lines, model=9000):
+def crate_loads(lines):
+    """Crates drawn in the crane config `lines`, as `Load`s from bottom to
+    top"""
     bottom_to_top = list(reversed(lines))
-    crane_type = crane_model(model)
-    crane = crane_type.from_spec(bottom_to_top[0])
     indexes = {
         i: None if n == ' ' else int(n) for i, n in enumerate(bottom_to_top[0])
     }
@@ -142,15 +144,38 @@ def read_crane(lines, model=9000):
                 loads.append(load)
             except Exception as e:
                 pass
-    for load in loads:
+    return loads
+
+def read_crane(lines, model=9000):
+    crane_type = crane_model(model)
+    crane = crane_type.from_spec(lines[-1])
+    for load in crate_loads(lines):
         crane.load(*load)
     return crane
 
-def top_crates(lines, model):
+class Plan(namedtuple('Plan', 'stacks loads moves')):
+    """Numbers of the stacks, crates loaded on them and moves to apply,
+    which any crane model can be set up from"""
+
+    def crane(self, model):
+        crane = crane_model(model)(*[Stack(n) for n in self.stacks])
+        for load in self.loads:
+            crane.load(*load)
+        return crane
+
+@cached()
+def read_plan(lines):
     lines = list(lines)
     config = read_initial_crane_config_section(lines)
-    crane = read_crane(config, model=model)
-    return message_after_apply_steps(lines, crane=crane)
+    stacks = [int(n) for n in config[-1].split()]
+    return Plan(stacks, crate_loads(config), read_moves(lines))
+
+def top_crates(lines, model):
+    plan = read_plan(lines)
+    crane = plan.crane(model)
+    for move in plan.moves:
+        crane.apply(move)
+    return ''.join(map(str, crane.top_crates))
 
 def top_crates_9000(lines):
     return top_crates(lines, model=9000)
@@ -0,0 +1,47 @@
+from utils import get_logger
+log = get_logger(__name__)
+
+from advent2022 import cache, rock
+from advent2022.bench import percentile, summary, measure, regressions, parsed, bench
+
+def test_summary():
+    stats = summary([0.5, 0.1, 0.3, 0.2, 0.4])
+    assert stats['min'] == 0.1
+    assert stats['median'] == 0.3
+    assert stats['p95'] == 0.5
+    assert stats['runs'] == 5
+
+def test_percentile():
+    timings = list(range(1, 101))
+    assert percentile(timings, 95) == 95
+    assert percentile(timings, 100) == 100
+    assert percentile([7], 95) == 7
+
+def test_measure_skips_warmup():
+    calls = []
+    stats = measure(calls.append, 1, repeat=3, warmup=2)
+    assert len(calls) == 5
+    assert stats['runs'] == 3
+
+def report(median):
+    return {'results': {'1_1': {'solve': {'median': median}}}}
+
+def test_regressions():
+    assert list(regressions(report(1.05), report(1.0), threshold=0.1)) == []
+    assert list(regressions(report(1.2), report(1.0), threshold=0.1)) == [
+        ('1_1', 'solve', 1.0, 1.2)
+    ]
+    assert list(regressions(report(1.2), {'results': {}})) == []
+
+def test_parsed_hands_out_copies_of_the_model():
+    parser = rock.line_counts
+    model = parser(['A Y', 'A Y'])
+    with parsed(2, model, copies=2):
+        assert rock.total_score([]) == 16
+        assert rock.total_score([]) == 16
+    assert rock.line_counts is parser
+    assert rock.total_score([]) == 0
+
+def test_bench_restores_the_cache_flag():
+    bench([], [1])
+    assert cache.enabled
@@ -0,0 +1,99 @@
+import pytest
+
+from utils import get_logger, read_input, read_test_input
+log = get_logger(__name__)
+
+from advent2022 import cache
+from advent2022.cache import cached
+from advent2022.cathode import read_program, Noop, AddX
+from advent2022.device import filesystem
+from advent2022.supply import read_plan, top_crates_9000, top_crates_9001
+
+terminal = """
+$ cd /
+$ ls
+dir a
+14848514 b.txt
+$ cd a
+$ ls
+584 i
+"""
+
+@pytest.fixture
+def input_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path / 'cache')
+    filename = tmp_path / 'input.txt'
+    def write(text):
+        filename.write_text(text)
+        lines = read_input(42)
+        lines.filename = filename
+        return lines
+    return write
+
+def counting_parser(version=1):
+    calls = []
+    @cached(version=version)
+    def parse(lines):
+        calls.append(1)
+        return [line.upper() for line in lines]
+    return parse, calls
+
+def test_parsed_model_is_loaded_from_cache(input_file):
+    lines = input_file("a\nb\n")
+    parse, calls = counting_parser()
+    assert parse(lines) == ['A', 'B']
+    assert parse(lines) == ['A', 'B']
+    assert len(calls) == 1
+
+def test_cache_is_keyed_by_content_and_version(input_file):
+    parse, calls = counting_parser()
+    parse(input_file("a\n"))
+    assert parse(input_file("c\n")) == ['C']
+    assert len(calls) == 2
+    parse_v2, calls_v2 = counting_parser(version=2)
+    parse_v2(input_file("c\n"))
+    assert len(calls_v2) == 1
+
+def test_cache_bypass_and_clear(input_file, monkeypatch):
+    lines = input_file("a\n")
+    parse, calls = counting_parser()
+    parse(lines)
+    monkeypatch.setattr(cache, 'enabled', False)
+    parse(lines)
+    monkeypatch.setattr(cache, 'enabled', True)
+    cache.clear()
+    parse(lines)
+    assert len(calls) == 3
+
+def test_examples_are_not_cached(input_file):
+    parse, calls = counting_parser()
+    example = read_test_input("\na\n")
+    parse(example)
+    parse(example)
+    assert len(calls) == 2
+    assert not cache.CACHE_DIR.exists()
+
+def test_models_roundtrip(input_file):
+    lines = input_file("noop\naddx 3\n")
+    assert read_program(lines) == read_program(lines) == [Noop, AddX(3)]
+    assert read_program(lines)[0] is Noop
+
+    lines = input_file(terminal.lstrip())
+    assert filesystem(lines) == filesystem(lines)
+    assert filesystem(lines).size == 14849098
+
+def test_supply_plan_roundtrip(input_file):
+    lines = input_file("    [D]\n[N] [C]\n[Z] [M] [P]\n 1   2   3\n\nmove 1 from 2 to 1\n")
+    assert read_plan(lines) == read_plan(lines)
+    assert read_plan(lines).stacks == [1, 2, 3]
+    assert top_crates_9000(lines) == top_crates_9001(lines) == 'DCP'
+    assert top_crates_9000(lines) == 'DCP'
+
+def test_using_restores_the_flag():
+    with cache.using(False):
+        assert not cache.enabled
+        with pytest.raises(RuntimeError), cache.using(True):
+            assert cache.enabled
+            raise RuntimeError
+        assert not cache.enabled
+    assert cache.enabled
@@ -1,11 +1,30 @@
-from utils import read_test_input, get_logger
+import pytest
+from utils import read_test_input, read_input, get_logger
 
 log = get_logger(__name__)
 
+import pickle
+
 from advent2022.calories import (
+    Elf,
+    Food,
     most_calories_carried,
     top_three_carriers,
     top_three_total,
+    elf_totals,
+    top_k_total,
+    elf_totals_numpy,
+    top_k_total_numpy,
+    most_calories_carried_numpy,
+    top_three_total_numpy,
+    top_k_total_parallel,
+    most_calories_carried_parallel,
+    top_three_total_parallel,
+    calorie_sketch,
+    calorie_sketch_parallel,
+    calorie_quantiles,
+    ranked_elves,
+    Follower,
 )
 
 example = """
@@ -34,5 +53,151 @@ def test_top_three_carriers():
     top_carriers = top_three_carriers(lines)
     assert len(top_carriers) == 3
 
+def test_top_three_carriers_totals():
+    assert [elf.total_calories for elf in top_three_carriers(lines)] == [24000, 11000, 10000]
+
+def test_elf_keeps_the_list_api():
+    elf = Elf([1000, 2000])
+    elf.append(Food('3000'))
+    assert len(elf) == 3
+    assert elf.total_calories == 6000
+    assert list(elf) == [Food('1000'), Food('2000'), Food('3000')]
+    assert pickle.loads(pickle.dumps(elf)) == elf
+
+def test_elf_is_a_sequence_of_food():
+    elf = Elf([Food('1000'), '2000'])
+    assert elf[0] == Food('1000')
+    assert elf[-1] == Food('2000')
+    assert elf == [Food('1000'), Food('2000')]
+    elf.extend([Food('3000')])
+    elf.insert(0, Food('500'))
+    elf[1] = Food('100')
+    assert elf[:2] == [Food('500'), Food('100')]
+    assert elf.total_calories == 5600
+    assert elf.pop() == Food('3000')
+    del elf[0]
+    elf.remove(Food('100'))
+    assert elf == [Food('2000')]
+    assert elf.total_calories == 2000
+
 def test_top_three_carriers_carry_45000():
     assert top_three_total(lines) == 45000
+
+def test_elf_totals():
+    assert list(elf_totals(lines)) == [6000, 4000, 11000, 24000, 10000]
+
+def test_top_k_total():
+    assert top_k_total(lines, 1) == 24000
+    assert top_k_total(lines, 2) == 35000
+    assert top_k_total(lines, 3) == sum(elf.total_calories for elf in top_three_carriers(lines))
+    assert top_k_total(lines, 10) == 55000
+
+def test_top_k_total_over_bytes():
+    assert top_k_total([memoryview(b"1"), b"2", b"", b"4"], 1) == 4
+
+def test_numpy_engine_matches():
+    pytest.importorskip('numpy')
+    assert most_calories_carried_numpy(lines) == most_calories_carried(lines)
+    assert top_three_total_numpy(lines) == top_three_total(lines)
+    assert top_k_total_numpy(lines, 10) == top_k_total(lines, 10)
+
+@pytest.mark.parametrize('buffer', [
+    b'',
+    b'\n',
+    b'7',
+    b'1000\r\n20\r\n\r\n3\r\n',
+    b'1\n\n\n2  \n \n30\n',
+    b'1\n2\n\n',
+])
+def test_numpy_elf_totals_edge_cases(buffer):
+    pytest.importorskip('numpy')
+    lines = buffer.decode().splitlines()
+    expected = list(elf_totals(line.rstrip() for line in lines))
+    assert list(elf_totals_numpy(buffer)) == expected
+
+@pytest.mark.parametrize('buffer', [
+    b'1\n-2\n',
+    b' 5\n',
+    b'x\n',
+    b'1\n\n2x',
+    b'1' * 19,
+])
+def test_numpy_elf_totals_rejects_invalid_ledgers(buffer):
+    pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        elf_totals_numpy(buffer)
+
+@pytest.mark.parametrize('ledger', [
+    example.lstrip(),
+    example.lstrip().replace('\n', '\r\n'),
+    example.strip(),
+    '',
+])
+def test_parallel_engine_matches(tmp_path, ledger):
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(ledger.encode())
+    lines = read_input(filename)
+    for k in (1, 3, 10):
+        assert top_k_total_parallel(lines, k, workers=2, parts=4) == top_k_total(lines, k)
+
+def test_parallel_engine_falls_back_for_examples():
+    assert most_calories_carried_parallel(lines) == 24000
+    assert top_three_total_parallel(lines) == 45000
+
+def test_calorie_quantiles():
+    assert calorie_quantiles(lines, [0, 0.5, 1]) == [4000, 10000, 24000]
+    assert calorie_sketch(lines).histogram([0, 10000, 25000]) == [3, 2]
+
+@pytest.mark.parametrize('ledger', [
+    example.lstrip(),
+    example.lstrip().replace('\n', '\r\n'),
+    example.strip(),
+])
+def test_parallel_sketch_counts_every_elf_once(tmp_path, ledger):
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(ledger.encode())
+    lines = read_input(filename)
+    sketch = calorie_sketch_parallel(lines, workers=2, parts=4)
+    assert sketch.n == 5
+    assert sorted(sketch.quantiles([0.2, 0.4, 0.6, 0.8, 1])) == [4000, 6000, 10000, 11000, 24000]
+
+@pytest.mark.parametrize('run_size', [1, 2, 1 << 20])
+def test_ranked_elves(run_size):
+    assert list(ranked_elves(lines, run_size=run_size, fan_in=2)) == [
+        (1, 3, 24000),
+        (2, 2, 11000),
+        (3, 4, 10000),
+        (4, 0, 6000),
+        (5, 1, 4000),
+    ]
+
+def test_follower_reads_only_appended_lines(tmp_path):
+    ledger = example.lstrip()
+    filename = tmp_path / 'ledger.txt'
+    follower = Follower(filename)
+    for cut in (0, 7, 12, 24, 31, len(ledger)):
+        filename.write_text(ledger[:cut])
+        follower.refresh()
+        assert follower.offset == ledger[:cut].rfind('\n') + 1
+    assert follower.total == top_three_total(lines)
+
+    with open(filename, 'a') as f:
+        f.write("\n50000\n")
+    assert follower.refresh() == 50000 + 24000 + 11000
+
+def test_follower_state_roundtrip(tmp_path):
+    filename = tmp_path / 'ledger.txt'
+    filename.write_text(example.lstrip()[:20])
+    follower = Follower(filename, k=2)
+    follower.refresh()
+    resumed = Follower.from_dict(follower.to_dict())
+    filename.write_text(example.lstrip())
+    assert resumed.refresh() == top_k_total(lines, 2)
+
+def test_follower_restarts_on_truncation(tmp_path):
+    filename = tmp_path / 'ledger.txt'
+    filename.write_text(example.lstrip())
+    follower = Follower(filename)
+    follower.refresh()
+    filename.write_text("1\n\n2\n")
+    assert follower.refresh() == 3
@@ -1,5 +1,5 @@
 import pytest
-from utils import read_test_input, get_logger
+from utils import read_test_input, read_input, get_logger
 
 log = get_logger(__name__)
 
@@ -20,6 +20,17 @@ from advent2022.rock import (
     decode_result,
     choose_right,
     total_score_strategy_guide,
+    score_table,
+    LINES,
+    total_score_numpy,
+    scores,
+    best_mapping,
+    scores_parallel,
+    total_score_parallel,
+    total_score_strategy_guide_parallel,
+    shape_decoder,
+    outcome_decoder,
+    total_score_strategy_guide_numpy,
 )
 
 
@@ -94,3 +105,97 @@ def test_total_score_is_12():
 
 def test_total_score_strategy_guide_is_12():
     assert total_score_strategy_guide(lines) == 12
+
+def test_score_table():
+    assert len(score_table(Round.from_line)) == 9
+    assert score_table(Round.from_line)['A Y'] == 8
+    assert score_table(Round.from_line_right_drives_play)['A Y'] == 4
+
+def test_histogram_matches_round_by_round():
+    many = LINES * 7 + ['A Y ', 'C  X']
+    for line_round in (Round.from_line, Round.from_line_right_drives_play):
+        expected = sum(play_score(*line_round(line)) for line in many)
+        assert total_score(many, line_round=line_round) == expected
+
+def test_invalid_lines_are_rejected():
+    with pytest.raises(KeyError):
+        total_score(['A Y', 'D X'])
+    with pytest.raises(KeyError):
+        total_score_strategy_guide(['A Y', 'A W'])
+    with pytest.raises(ValueError):
+        total_score(['A Y', 'A'])
+
+def test_numpy_engine_matches_examples():
+    pytest.importorskip('numpy')
+    assert total_score_numpy(lines) == 15
+    assert total_score_strategy_guide_numpy(lines) == 12
+
+@pytest.mark.parametrize('guide', [
+    'A Y\nB X\nC Z\n',
+    'A Y\nB X\nC Z',
+    'A Y\r\nB X\r\nC Z\r\n',
+    'A Y\nB X\nC Z\n\n',
+    'A Y \nB X\nC Z\n',
+    'A Y\nB  X\r\nC Z\t\n',
+    '\n'.join(LINES * 3),
+    '',
+])
+def test_numpy_engine_matches(tmp_path, guide):
+    pytest.importorskip('numpy')
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(guide.encode())
+    guide_lines = [line for line in guide.splitlines() if line]
+    assert total_score_numpy(read_input(filename)) == total_score(guide_lines)
+    assert total_score_strategy_guide_numpy(read_input(filename)) == total_score_strategy_guide(guide_lines)
+
+@pytest.mark.parametrize('guide, error', [
+    ('A Y\nD X\n', KeyError),
+    ('A Y\nB-X\n', ValueError),
+])
+def test_numpy_engine_rejects_invalid_guides(tmp_path, guide, error):
+    pytest.importorskip('numpy')
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(guide.encode())
+    with pytest.raises(error):
+        total_score_numpy(read_input(filename))
+    with pytest.raises(error):
+        total_score_strategy_guide_numpy(read_input(filename))
+
+def test_scores_of_both_puzzles():
+    assert scores(lines) == (15, 12)
+
+def test_scores_of_alternative_decoders():
+    decoders = [
+        shape_decoder({'X': Rock, 'Y': Paper, 'Z': Scissors}),
+        outcome_decoder({'X': Lose, 'Y': Draw, 'Z': Win}),
+        shape_decoder({'X': Paper, 'Y': Scissors, 'Z': Rock}),
+    ]
+    assert scores(lines, decoders) == (15, 12, 3 + 5 + 7)
+
+def test_scores_read_lines_once():
+    assert scores(iter(lines)) == (15, 12)
+
+@pytest.mark.parametrize('guide', [
+    'A Y\nB X\nC Z\n',
+    'A Y\r\nB X\r\nC Z',
+    '\n'.join(LINES * 50),
+    '',
+])
+def test_parallel_engine_matches(tmp_path, guide):
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(guide.encode())
+    guide_lines = guide.splitlines()
+    expected = (total_score(guide_lines), total_score_strategy_guide(guide_lines))
+    assert scores_parallel(read_input(filename), workers=2, parts=7) == expected
+
+def test_parallel_engine_falls_back_for_examples():
+    assert total_score_parallel(lines) == 15
+    assert total_score_strategy_guide_parallel(lines) == 12
+
+def test_best_mapping():
+    ranked = best_mapping(lines)
+    assert len(ranked) == 12
+    assert [m.score for m in ranked] == sorted((m.score for m in ranked), reverse=True)
+    assert (15, 'shape', {'X': Rock, 'Y': Paper, 'Z': Scissors}) in ranked
+    assert (12, 'outcome', {'X': Lose, 'Y': Draw, 'Z': Win}) in ranked
+    assert ranked[0] == (24, 'shape', {'X': Scissors, 'Y': Paper, 'Z': Rock})
@@ -1,5 +1,5 @@
 import pytest
-from utils import read_test_input, get_logger
+from utils import read_test_input, read_input, get_logger
 
 log = get_logger(__name__)
 
@@ -15,6 +15,12 @@ from advent2022.rucksacks import (
     Badge,
     sum_badges_priorities,
     sum_priorities_elf_groups,
+    item_mask,
+    mask_priorities,
+    group_badge_mask,
+    groups_of,
+    sum_priorities_of_common_items_numpy,
+    sum_priorities_elf_groups_numpy,
 )
 
 example = """
@@ -136,3 +142,81 @@ def test_grups_of_trhee_elves():
 
 def test_sum_priorities_elf_groups():
     assert sum_priorities_elf_groups(lines) == 70
+
+def test_groups_of_streams_lines():
+    assert list(groups_of(iter('abcdef'), 2)) == [['a', 'b'], ['c', 'd'], ['e', 'f']]
+    groups = groups_of(iter('abc'), 2)
+    assert next(groups) == ['a', 'b']
+    with pytest.raises(AssertionError):
+        next(groups)
+
+def test_partial_groups_are_rejected():
+    with pytest.raises(AssertionError):
+        group_elves(list(lines)[:4])
+    with pytest.raises(AssertionError):
+        sum_priorities_elf_groups(iter(list(lines)[:5]))
+
+def test_groups_of_any_size():
+    assert Group.from_elves(Elf.from_line('abc'), Elf.from_line('cd')).badge == Badge('c')
+    assert sum_priorities_elf_groups(iter(['ab', 'bc', 'bd', 'be']), n=4) == 2
+    assert sum_priorities_elf_groups(['ab', 'bc', 'cd', 'de'], n=2) == 2 + 4
+    assert len(group_elves(['ab', 'bc', 'cd', 'de'], n=2)) == 2
+
+def test_item_mask():
+    assert item_mask('aab') == 0b11
+    assert item_mask('Z') == 1 << 51
+    assert item_mask('') == 0
+
+def test_mask_priorities():
+    assert mask_priorities(item_mask('p')) == 16
+    assert mask_priorities(item_mask('aZ')) == 53
+    assert mask_priorities(0) == 0
+
+def test_bitmask_matches_sets():
+    for line in lines:
+        rucksack = Rucksack.from_line(line)
+        first, second = halves(line)
+        expected = sum(item.priority for item in rucksack.common_items())
+        assert mask_priorities(item_mask(first) & item_mask(second)) == expected
+
+def test_group_badge_mask():
+    elves = 'vJrwpWtwJgWrhcsFMMfFFhFp', 'jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL', 'PmmdzqPrVvPwwTWBwg'
+    assert group_badge_mask(*elves) == item_mask('r')
+    with pytest.raises(AssertionError):
+        group_badge_mask('ab', 'ab', 'ab')
+
+def test_odd_rucksacks_are_rejected():
+    with pytest.raises(AssertionError):
+        sum_priorities_of_common_items(['abc'])
+
+@pytest.mark.parametrize('manifest', [
+    example.lstrip(),
+    example.strip(),
+    example.lstrip().replace('\n', '\r\n'),
+    example.lstrip() + '\n',
+    example.lstrip().replace('\n', ' \n'),
+    example.lstrip().replace('\n', '\t \r\n', 2),
+])
+def test_numpy_engine_matches(tmp_path, manifest):
+    pytest.importorskip('numpy')
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(manifest.encode())
+    assert sum_priorities_of_common_items_numpy(read_input(filename)) == 157
+    assert sum_priorities_elf_groups_numpy(read_input(filename)) == 70
+
+def test_numpy_engine_matches_examples():
+    pytest.importorskip('numpy')
+    assert sum_priorities_of_common_items_numpy(lines) == sum_priorities_of_common_items(lines)
+    assert sum_priorities_elf_groups_numpy(lines) == sum_priorities_elf_groups(lines)
+    assert sum_priorities_of_common_items_numpy(['', 'aA']) == 0
+
+@pytest.mark.parametrize('solver, manifest', [
+    (sum_priorities_of_common_items_numpy, ['abc']),
+    (sum_priorities_of_common_items_numpy, ['ab', 'a-']),
+    (sum_priorities_elf_groups_numpy, ['ab', 'ab']),
+    (sum_priorities_elf_groups_numpy, ['ab', 'ab', 'ab']),
+])
+def test_numpy_engine_rejects_invalid_manifests(solver, manifest):
+    pytest.importorskip('numpy')
+    with pytest.raises(AssertionError):
+        solver(manifest)
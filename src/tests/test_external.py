@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from advent2022.external import external_sorted, write_run, read_run
+
+def pairs(n, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randint(-1000, 1000), i) for i in range(n)]
+
+def test_run_roundtrip(tmp_path):
+    data = pairs(10_000)
+    assert list(read_run(write_run(data, tmp_path / 'run'))) == data
+
+@pytest.mark.parametrize('run_size, fan_in', [
+    (100_000, 64),
+    (1000, 64),
+    (100, 3),
+    (7, 2),
+])
+def test_external_sorted(tmp_path, run_size, fan_in):
+    data = pairs(5000)
+    ranked = external_sorted(iter(data), run_size=run_size, fan_in=fan_in, directory=tmp_path)
+    assert list(ranked) == sorted(data)
+    assert list(tmp_path.iterdir()) == []
+
+def test_external_sorted_empty():
+    assert list(external_sorted(iter([]), run_size=2)) == []
+
+@pytest.mark.parametrize('run_size, fan_in', [(0, 64), (3, 1), (3, 0)])
+def test_external_sorted_rejects_degenerate_sizes(run_size, fan_in):
+    with pytest.raises(ValueError):
+        external_sorted(iter(pairs(10)), run_size=run_size, fan_in=fan_in)
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from utils import get_logger
+log = get_logger(__name__)
+
+from advent2022.generators import generate, GENERATORS
+from advent2022.solvers import SOLVERS, load
+
+def generated(day, scale, seed=0):
+    out = io.StringIO()
+    generate(day, out, scale, seed=seed)
+    return out.getvalue()
+
+@pytest.mark.parametrize('day', sorted(GENERATORS))
+def test_generated_inputs_are_solvable(day):
+    lines = generated(day, scale=20).splitlines()
+    results = {
+        key: load(entry)(lines)
+        for key, entry in SOLVERS.items() if key.startswith(f'{day}_')
+    }
+    if day == 7:
+        assert results['7_2'] > 0
+
+@pytest.mark.parametrize('day', sorted(GENERATORS))
+def test_generated_inputs_are_reproducible(day):
+    assert generated(day, scale=50, seed=1) == generated(day, scale=50, seed=1)
+    assert generated(day, scale=50, seed=1) != generated(day, scale=50, seed=2)
+
+def test_scales():
+    assert len(generated(2, scale=7).splitlines()) == 7
+    assert len(generated(3, scale=4).splitlines()) == 12
+    assert len(generated(6, scale=1000).strip()) == 1000
+    assert load(SOLVERS['6_2'])(generated(6, scale=1000).splitlines()) == 1000
+    assert generated(8, scale=9).splitlines()[0].isdigit()
+    assert len(generated(8, scale=9).splitlines()) == 9
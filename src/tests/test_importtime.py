@@ -0,0 +1,37 @@
+from utils import get_logger
+log = get_logger(__name__)
+
+from advent2022.importtime import parse_importtime, import_times, total_us, ImportTime, CLI_MODULES
+from advent2022.solvers import SOLVERS, solver
+
+stderr = """
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       900 |       1020 | utils
+import time:        30 |       1050 | advent2022
+some warning
+"""
+
+def test_parse_importtime():
+    assert parse_importtime(stderr) == [
+        ImportTime('_io', 120, 120),
+        ImportTime('utils', 900, 1020),
+        ImportTime('advent2022', 30, 1050),
+    ]
+    assert total_us('utils', parse_importtime(stderr)) == 1020
+
+def test_solvers_import_only_their_day():
+    times = import_times('advent2022.solvers')
+    names = [t.name for t in times]
+    assert 'advent2022.solvers' in names
+    assert not any(module in names for module, _ in SOLVERS.values())
+
+def test_cli_entry_point_is_timed():
+    assert CLI_MODULES == ('advent2022.__main__', )
+    names = [t.name for t in import_times('advent2022.__main__')]
+    assert 'advent2022.cache' in names
+    assert not any(module in names for module, _ in SOLVERS.values())
+
+def test_solver_is_loaded_on_demand():
+    assert solver(1, 1).__name__ == 'most_calories_carried'
+    assert solver('10', '2').__module__ == 'advent2022.cathode'
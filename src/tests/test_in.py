@@ -1,5 +1,16 @@
+import bz2
+import gzip
+import io
+import lzma
 import tempfile
-from utils import read_input, get_logger, read_test_input, Input
+from pathlib import Path
+
+import pytest
+import utils
+from utils import (
+    read_input, get_logger, read_test_input, Input, LineIndex,
+    iter_lines, iter_block_lines, split_ranges,
+)
 log = get_logger(__name__)
 
 def test_can_read_input():
@@ -76,3 +87,125 @@ def test_input_day_10():
 def test_input_day_11():
     lines = read_input(11)
     assert len(lines) == 55
+
+def test_input_mmap():
+    with tempfile.NamedTemporaryFile(mode="w+b") as f:
+        f.write(b"1000\r\n2000  \n\n3000")
+        f.flush()
+        with read_input(42, mmap=True) as input_object:
+            input_object.filename = f.name
+            lines = list(input_object)
+            assert all(isinstance(line, memoryview) for line in lines)
+            assert [bytes(line) for line in lines] == [b"1000", b"2000", b"", b"3000"]
+            assert sum(int(line) for line in lines if line) == 6000
+            del lines
+
+def test_input_mmap_empty_file():
+    with tempfile.NamedTemporaryFile(mode="w+b") as f:
+        input_object = read_input(42, mmap=True)
+        input_object.filename = f.name
+        assert list(input_object) == []
+
+def test_input_line_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'input.txt'
+        filename.write_text("a\nbb\r\n\nccc  \nd")
+        input_object = read_input(42)
+        input_object.filename = filename
+        assert len(input_object) == 5
+        assert (Path(tmp) / 'input.txt.idx').exists()
+        assert input_object[1] == "bb"
+        assert input_object[-2] == "ccc"
+        assert input_object[1:4] == ["bb", "", "ccc"]
+        assert input_object[::2] == ["a", "", "d"]
+        assert input_object[1:4] == list(input_object)[1:4]
+        with pytest.raises(IndexError):
+            input_object[5]
+
+        with read_input(42, mmap=True) as mapped:
+            mapped.filename = filename
+            assert bytes(mapped[3]) == b"ccc"
+
+        with open(filename, 'a') as f:
+            f.write("\neee\n")
+        assert len(input_object) == 6
+        assert input_object[5] == "eee"
+        index = LineIndex.for_file(filename)
+        assert len(index) == 6
+
+def test_line_index_of_explicit_paths_is_not_persisted(tmp_path):
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(b"a\nbb\r\n\nccc")
+    lines = read_input(filename)
+    assert len(lines) == 4
+    assert list(lines.index.offsets) == [0, 2, 6, 7, 10]
+    assert not (tmp_path / 'input.txt.idx').exists()
+    assert list(LineIndex.for_file(filename, persist=True).offsets) == [0, 2, 6, 7, 10]
+    assert (tmp_path / 'input.txt.idx').exists()
+
+@pytest.mark.parametrize('suffix, compression', [
+    ('.gz', gzip),
+    ('.xz', lzma),
+    ('.bz2', bz2),
+])
+def test_input_compressed(tmp_path, suffix, compression):
+    filename = tmp_path / f'input.txt{suffix}'
+    with compression.open(filename, 'wt') as f:
+        f.write("1000  \r\n2000\n\n3000\n")
+    lines = read_input(filename)
+    assert list(lines) == ["1000", "2000", "", "3000"]
+    with pytest.raises(TypeError):
+        len(lines)
+    assert lines.count_lines() == 4
+    assert lines[1] == "2000"
+    assert lines[-1] == "3000"
+    assert lines[1:3] == ["2000", ""]
+    with pytest.raises(IndexError):
+        lines[4]
+    with pytest.raises(ValueError):
+        read_input(filename, mmap=True).mapped()
+
+def test_input_compressed_is_read_once(tmp_path, monkeypatch):
+    filename = tmp_path / 'input.txt.gz'
+    with gzip.open(filename, 'wt') as f:
+        f.write("a\nb\n")
+    opened = []
+    open_compressed = utils._open_compressed
+    monkeypatch.setattr(utils, '_open_compressed', lambda name: opened.append(name) or open_compressed(name))
+    assert read_input(filename).read() == ["a", "b"]
+    assert len(opened) == 1
+
+def test_input_zstandard(tmp_path):
+    zstandard = pytest.importorskip('zstandard')
+    filename = tmp_path / 'input.txt.zst'
+    filename.write_bytes(zstandard.ZstdCompressor().compress(b"1000\n\n2000\n"))
+    assert list(read_input(filename)) == ["1000", "", "2000"]
+
+def test_input_path(tmp_path):
+    filename = tmp_path / 'input.txt'
+    filename.write_text("a\nb\n")
+    assert list(read_input(str(filename))) == ["a", "b"]
+
+def test_input_stdin(monkeypatch):
+    monkeypatch.setattr('sys.stdin', io.StringIO("1000 \n2000\n"))
+    lines = read_input('-')
+    assert list(lines) == ["1000", "2000"]
+    with pytest.raises(TypeError):
+        len(lines)
+
+def test_split_ranges():
+    buffer = b"1\n2\n\n3\n\n4\n5\n\n6"
+    ranges = split_ranges(buffer, 3, b"\n\n")
+    assert ranges == [(0, 8), (8, 13), (13, 14)]
+    assert b"".join(buffer[start:end] for start, end in ranges) == buffer
+    assert split_ranges(buffer, 100, b"\n\n") == [(0, 5), (5, 8), (8, 13), (13, 14)]
+    assert split_ranges(b"1\n2\n", 4) == [(0, 2), (2, 4)]
+    assert split_ranges(b"", 4) == [(0, 0)]
+
+def test_iter_block_lines():
+    buffer = b"1000 \r\n2000\n\n30000000\n4\n"
+    expected = [bytes(line) for line in iter_lines(buffer)]
+    assert expected == [b"1000", b"2000", b"", b"30000000", b"4"]
+    for block_size in (1, 3, 8, 100):
+        assert list(iter_block_lines(buffer, block_size=block_size)) == expected
+    assert list(iter_block_lines(buffer, 7, 13, block_size=2)) == [b"2000", b""]
@@ -0,0 +1,28 @@
+import logging
+
+from utils import get_logger, trace
+log = get_logger(__name__)
+
+class Expensive:
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __repr__(self):
+        self.formatted += 1
+        return 'Expensive()'
+
+def test_trace_does_not_format_when_disabled(caplog):
+    value = Expensive()
+    with caplog.at_level(logging.INFO):
+        trace(log, 'value=%r', value)
+    assert value.formatted == 0
+    assert caplog.records == []
+
+def test_trace_logs_when_enabled(caplog):
+    value = Expensive()
+    with caplog.at_level(logging.DEBUG):
+        trace(log, 'value=%r', value)
+    assert value.formatted == 1
+    assert caplog.records[0].getMessage() == 'value=Expensive()'
+    assert caplog.records[0].funcName == 'test_trace_logs_when_enabled'
@@ -0,0 +1,30 @@
+import io
+import pstats
+
+from utils import get_logger
+log = get_logger(__name__)
+
+from advent2022.profiling import profile_cpu, profile_mem
+
+def build_model(n):
+    model = [(i, str(i)) for i in range(n)]
+    return len(model)
+
+def test_profile_cpu(tmp_path):
+    output = tmp_path / 'solver.pstats'
+    report = io.StringIO()
+    assert profile_cpu(build_model, 1000, output=str(output), top=5, stream=report) == 1000
+    assert 'build_model' in report.getvalue()
+    stats = pstats.Stats(str(output))
+    assert any(name == 'build_model' for _, _, name in stats.stats)
+
+def test_profile_mem_reports_live_model():
+    report = io.StringIO()
+    assert profile_mem(build_model, 10000, top=3, stream=report) == 10000
+    lines = report.getvalue().splitlines()
+    assert lines[0].startswith('peak traced memory:')
+    assert 'test_profiling.py' in lines[2]
+
+def test_reports_go_to_the_current_stderr(capsys):
+    profile_mem(build_model, 100, top=1)
+    assert 'peak traced memory' in capsys.readouterr().err
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from utils import get_logger, read_input
+log = get_logger(__name__)
+
+from advent2022 import cache, runner
+from advent2022.runner import parse_selection, selected_solvers, run_day
+
+def test_parse_selection():
+    assert parse_selection('1-3') == [1, 2, 3]
+    assert parse_selection('1,2') == [1, 2]
+    assert parse_selection('1,5-7,11') == [1, 5, 6, 7, 11]
+
+def test_selected_solvers_skips_missing_ones():
+    assert selected_solvers([10, 11], [1, 2]) == {10: [1, 2], 11: [1]}
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    def fake_read_input(day):
+        lines = read_input(day)
+        lines.filename = tmp_path / f'{day}.txt'
+        return lines
+    monkeypatch.setattr(runner, 'read_input', fake_read_input)
+    return tmp_path
+
+def test_run_day_shares_input(inputs):
+    (inputs / '1.txt').write_text("1000\n2000\n\n4000\n\n500\n")
+    records = run_day(1, [1, 2], use_cache=False)
+    assert [(r['puzzle'], r['result']) for r in records] == [(1, 4000), (2, 7500)]
+    assert all(r['wall'] >= 0 and r['cpu'] >= 0 for r in records)
+    assert json.loads(json.dumps(records))
+
+def test_run_day_reports_errors(inputs):
+    records = run_day(2, [1, 2], use_cache=False)
+    assert [r['puzzle'] for r in records] == [1, 2]
+    assert all('FileNotFoundError' in r['error'] for r in records)
+
+def test_run_day_restores_the_cache_flag(inputs):
+    (inputs / '1.txt').write_text("1000\n")
+    run_day(1, [1], use_cache=False)
+    assert cache.enabled
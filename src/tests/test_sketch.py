@@ -0,0 +1,59 @@
+import bisect
+import random
+
+import pytest
+
+from advent2022.sketch import KLL
+
+def stream(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(0, 100_000) for _ in range(n)]
+
+def max_rank_error(sketch, values):
+    ordered = sorted(values)
+    return max(
+        abs(sketch.rank(value) - bisect.bisect_right(ordered, value))
+        for value in ordered[::101]
+    ) / len(values)
+
+def test_small_streams_are_exact():
+    sketch = KLL(k=200)
+    for value in range(100):
+        sketch.update(value)
+    assert sketch.rank(49) == 50
+    assert sketch.quantiles([0, 0.5, 1]) == [0, 49, 99]
+
+def test_memory_is_bounded():
+    sketch = KLL(k=100, seed=1)
+    for value in stream(50_000):
+        sketch.update(value)
+    assert sketch.n == 50_000
+    assert sketch.size < 400
+
+def test_rank_error_within_bound():
+    values = stream(50_000)
+    sketch = KLL(k=200, seed=1)
+    for value in values:
+        sketch.update(value)
+    assert max_rank_error(sketch, values) <= sketch.error_bound
+
+def test_merged_sketches_keep_the_bound():
+    values = stream(50_000)
+    merged = KLL(k=200, seed=1)
+    for part in range(5):
+        partial = KLL(k=200, seed=part)
+        for value in values[part::5]:
+            partial.update(value)
+        merged.merge(partial)
+    assert merged.n == len(values)
+    assert max_rank_error(merged, values) <= merged.error_bound
+
+def test_histogram_counts_add_up():
+    sketch = KLL()
+    for value in range(1, 11):
+        sketch.update(value)
+    assert sketch.histogram([0, 5, 10]) == [5, 5]
+
+def test_empty_sketch_has_no_quantiles():
+    with pytest.raises(ValueError):
+        KLL().quantile(0.5)
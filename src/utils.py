@@ -1,37 +1,360 @@
 """Global utilities"""
 
+from array import array
+from itertools import accumulate, islice
 from pathlib import Path
+import io
+import mmap
 import os
+import sys
 
 import logging
-logging.basicConfig(level=logging.DEBUG)
 
 log = logging.getLogger(__name__)
 
+LOG_FORMAT = '%(levelname)s | %(name)s | %(message)s'
+
 def get_logger(name):
     return logging.getLogger(name)
 
+def setup_logging(level=logging.WARNING):
+    """Configures logging for a command line run. Importing modules never
+    configures logging by itself."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+def trace(logger, msg, *args):
+    """Debug logging for hot paths. Pass the values as `args`, not as an
+    f-string: they are only formatted when DEBUG is enabled for `logger`,
+    otherwise this returns right after the (cached) level check."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args, stacklevel=2)
+
 _CURRENT = os.path.dirname(os.path.abspath(__file__))
 
+_WHITESPACE = b' \t\n\r\x0b\x0c'
+
+def iter_lines(buffer, start=0, end=None):
+    """Yields the `rstrip`'d lines of `buffer[start:end]` as memoryview
+    slices, so nothing is decoded nor copied. `buffer` must support `find`
+    (`bytes`, `mmap`)."""
+    view = memoryview(buffer)
+    end = len(view) if end is None else end
+    while start < end:
+        stop = buffer.find(b'\n', start, end)
+        following = end if stop == -1 else stop + 1
+        if stop == -1:
+            stop = end
+        while stop > start and buffer[stop - 1] in _WHITESPACE:
+            stop -= 1
+        yield view[start:stop]
+        start = following
+
+
+def iter_block_lines(buffer, start=0, end=None, block_size=1 << 24):
+    """Yields the `rstrip`'d lines of `buffer[start:end]` as `bytes`, copying
+    about `block_size` bytes (cut after a newline) at a time. Faster than
+    `iter_lines` for full scans, with memory bounded by the block size."""
+    end = len(buffer) if end is None else end
+    while start < end:
+        stop = end
+        if start + block_size < end:
+            newline = buffer.rfind(b'\n', start, start + block_size)
+            if newline == -1:
+                newline = buffer.find(b'\n', start + block_size, end)
+            if newline != -1:
+                stop = newline + 1
+        yield from map(bytes.rstrip, buffer[start:stop].splitlines())
+        start = stop
+
+
+def split_ranges(buffer, parts, separator=b'\n'):
+    """Splits `buffer` into at most `parts` contiguous `(start, end)` ranges
+    of about the same size, each one ending right after a `separator` (or at
+    the end of the buffer), so no record spans two ranges"""
+    size = len(buffer)
+    bounds = [0]
+    for i in range(1, parts):
+        found = buffer.find(separator, max(size * i // parts, bounds[-1]))
+        if found == -1:
+            break
+        cut = found + len(separator)
+        if bounds[-1] < cut < size:
+            bounds.append(cut)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+class LineIndex:
+    """Offsets where every line of a file starts, followed by the offset
+    where the last one ends, as an `array` of uint64.
+
+    Indexes of the days' inputs are persisted next to them as
+    `<filename>.idx`: a header with the size and mtime of the file it was
+    built from and then the offsets."""
+
+    SUFFIX = '.idx'
+
+    def __init__(self, offsets, size=0, mtime=0):
+        self.offsets = offsets
+        self.size = size
+        self.mtime = mtime
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def span(self, i):
+        return self.offsets[i], self.offsets[i + 1]
+
+    @classmethod
+    def build(cls, lines, size=0, mtime=0):
+        """Index of the binary `lines` of a file, as iterated from it"""
+        return cls(array('Q', accumulate(map(len, lines), initial=0)), size, mtime)
+
+    @classmethod
+    def for_file(cls, filename, persist=False):
+        """Index of `filename`. With `persist`, the index saved next to it
+        is loaded, and (re)built and saved when missing or stale (file size
+        or mtime changed)."""
+        stat = os.stat(filename)
+        index_filename = Path(f'{filename}{cls.SUFFIX}')
+        if persist:
+            index = cls._load(index_filename)
+            if index is not None and (index.size, index.mtime) == (stat.st_size, stat.st_mtime_ns):
+                return index
+        with open(filename, 'rb') as f:
+            index = cls.build(f, stat.st_size, stat.st_mtime_ns)
+        if persist:
+            index._save(index_filename)
+        return index
+
+    @classmethod
+    def _load(cls, index_filename):
+        try:
+            with open(index_filename, 'rb') as f:
+                header = array('Q')
+                header.fromfile(f, 2)
+                offsets = array('Q')
+                offsets.frombytes(f.read())
+        except (OSError, EOFError):
+            return None
+        size, mtime = header
+        return cls(offsets, size, mtime)
+
+    def _save(self, index_filename):
+        tmp = index_filename.with_name(f'{index_filename.name}.{os.getpid()}')
+        try:
+            with open(tmp, 'wb') as f:
+                array('Q', [self.size, self.mtime]).tofile(f)
+                self.offsets.tofile(f)
+            os.replace(tmp, index_filename)
+        except OSError as e:
+            log.debug('Unable to persist line index %s: %s', index_filename, e)
+
+
+STDIN = '-'
+
+COMPRESSED_SUFFIXES = ('.gz', '.xz', '.lzma', '.bz2', '.zst', '.zstd')
+
+def _open_compressed(filename):
+    """Opens `filename` as a binary stream decompressed on the fly according
+    to its suffix, or returns None when it isn't compressed"""
+    match Path(filename).suffix:
+        case '.gz':
+            import gzip
+            return gzip.open(filename, 'rb')
+        case '.xz' | '.lzma':
+            import lzma
+            return lzma.open(filename, 'rb')
+        case '.bz2':
+            import bz2
+            return bz2.open(filename, 'rb')
+        case '.zst' | '.zstd':
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError('Reading .zst inputs needs the zstandard package') from e
+            return zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb'), closefd=True)
+        case _:
+            return None
+
+
 class Input:
+    """Lines of a puzzle input, `rstrip`'d. By default the input of `day`,
+    otherwise the file at `path`, decompressed as it is read when it has a
+    compression suffix (.gz, .xz, .bz2, .zst), or stdin when `path` is `-`.
+
+    Plain files are indexed (`LineIndex`) for `len()` and random access, and
+    can be memory mapped. Compressed files only support streaming: indexing
+    decompresses them up to where needed and, like stdin, they have no
+    `len()` (see `count_lines`). Stdin can only be iterated, once."""
+
+    def __init__(self, day=None, mmap=False, path=None):
+        if path is None:
+            path = Path(_CURRENT) / f'inputs/{day}/input.txt'
+        self.day = day
+        self.filename = path
+        self.mmap = mmap
+        self._mapping = None
+        self._index = None
+
+    @property
+    def stdin(self):
+        return self.filename == STDIN
+
+    @property
+    def compressed(self):
+        return not self.stdin and Path(self.filename).suffix in COMPRESSED_SUFFIXES
 
-    def __init__(self, day):
-        current = Path(_CURRENT)
-        self.filename = current / f'inputs/{day}/input.txt'
+    @property
+    def index(self):
+        """`LineIndex` of the input file, loaded once and refreshed when the
+        file changes"""
+        if self.stdin or self.compressed:
+            raise TypeError(f'{self.filename} is a stream and has no line index')
+        index = self._index
+        if index is not None:
+            stat = os.stat(self.filename)
+            if (index.size, index.mtime) != (stat.st_size, stat.st_mtime_ns):
+                index = None
+        if index is None:
+            index = self._index = LineIndex.for_file(self.filename, persist=self.day is not None)
+        return index
 
     def __len__(self):
-        with open(self.filename, 'r') as f:
-            return len(f.readlines())
+        return len(self.index)
+
+    def count_lines(self):
+        """Number of lines, also for compressed files, which have no `len()`
+        so that `list()` doesn't decompress them twice: this decompresses
+        the whole stream once just to count them"""
+        if self.compressed:
+            return sum(1 for _ in self)
+        return len(self)
+
+    def __getitem__(self, key):
+        if self.compressed:
+            return self._stream_getitem(key)
+        index = self.index
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(index))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return list(self._lines(index.offsets[start], index.offsets[stop]))
+        if key < 0:
+            key += len(index)
+        if not 0 <= key < len(index):
+            raise IndexError('Input index out of range')
+        return next(self._lines(*index.span(key)))
+
+    def _stream_getitem(self, key):
+        if isinstance(key, slice):
+            if any(i is not None and i < 0 for i in (key.start, key.stop)):
+                return list(self)[key]
+            return list(islice(self, key.start, key.stop, key.step))
+        if key < 0:
+            return list(self)[key]
+        try:
+            return next(islice(self, key, None))
+        except StopIteration:
+            raise IndexError('Input index out of range') from None
+
+    def _lines(self, start, end):
+        if self.mmap:
+            yield from iter_lines(self.mapped(), start, end)
+            return
+        with open(self.filename, 'rb') as f:
+            f.seek(start)
+            block = f.read(end - start)
+        for line in iter_lines(block):
+            yield str(line, 'utf-8').rstrip()
 
     def __iter__(self):
-        with open(self.filename, 'r') as f:
+        if self.mmap:
+            yield from iter_lines(self.mapped())
+            return
+        if self.stdin:
+            for line in sys.stdin:
+                yield line.rstrip()
+            return
+        with self._open() as f:
             for line in f:
                 yield line.rstrip()
 
+    def _open(self):
+        binary = _open_compressed(self.filename)
+        if binary is None:
+            return open(self.filename, 'r')
+        return io.TextIOWrapper(binary, encoding='utf-8')
+
+    def read(self):
+        """Reads every line at once, to be shared by several solvers"""
+        lines = Lines(iter(self))
+        lines.filename = self.filename
+        return lines
+
+    def mapped(self):
+        """Maps the input file read-only. The mapping stays open until
+        `close`, so the memoryviews handed out by `__iter__` remain valid."""
+        if self.stdin or self.compressed:
+            raise ValueError(f'{self.filename} is a stream and cannot be memory mapped')
+        if self._mapping is None:
+            with open(self.filename, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b''
+                self._mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapping
+
+    def close(self):
+        """Unmaps the input file. Raises `BufferError` while line views
+        are still referenced."""
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def plain_filename(lines):
+    """The file `lines` were read from, when it can be mapped (it is
+    neither stdin nor compressed), otherwise None"""
+    filename = getattr(lines, 'filename', None)
+    if filename in (None, STDIN) or Path(filename).suffix in COMPRESSED_SUFFIXES:
+        return None
+    return filename
+
+def read_bytes(lines):
+    """The bytes behind `lines`, for engines parsing whole buffers: the
+    memory mapped file of plain file `Input`s, the file contents for
+    `Lines` read from one, the lines joined back otherwise (examples,
+    streams)"""
+    filename = plain_filename(lines)
+    if isinstance(lines, Input) and filename is not None:
+        return lines.mapped()
+    if filename is not None:
+        return Path(filename).read_bytes()
+    return ''.join(f'{line}\n' for line in lines).encode()
+
+
+class Lines(list):
+    """Lines already read from `filename`"""
+
+    filename = None
+
 
-def read_input(day):
-    """Reads input file for `day`"""
-    return Input(day=day)
+def read_input(day, mmap=False):
+    """Reads input file for `day`. `day` can also be the path of an input
+    file, possibly compressed, or `-` for stdin. With `mmap` the file is
+    memory mapped and lines are yielded as `memoryview`s over the mapping
+    instead of `str`."""
+    if day == STDIN or not str(day).isdigit():
+        return Input(path=day, mmap=mmap)
+    return Input(day=day, mmap=mmap)
 
 class TestInput:
 